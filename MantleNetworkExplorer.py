@@ -2,9 +2,31 @@ import pandas as pd
 import json
 import os
 import argparse
+import base64
+import concurrent.futures
+import gzip
+import hashlib
+import html
+import pathlib
+import re
+import shutil
+import sqlite3
 import sys
+import time
+import zlib
 from collections import defaultdict, deque
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
 # --- Configuration Constants ---
 DATA_START_ROW = 24  # The data starts at row 25 (0-indexed)
 COLUMN_MAP = {
@@ -15,6 +37,55 @@ COLUMN_MAP = {
 # Column ranges for parsing dependencies
 PARAMS1_COLS = ('DF', 'HV')
 PARAMS2_COLS = ('HW', 'MN')
+# Node colors by item type
+NODE_COLOR_MAP = {
+    'Component': '#FF6B6B',
+    'Service': '#4ECDC4',
+    'Database': '#45B7D1',
+    'API': '#96CEB4',
+    'Interface': '#FFEAA7',
+    'Process': '#DDA0DD',
+    'System': '#98D8C8'
+}
+DEFAULT_NODE_COLOR = '#97C2FC'
+# Fields stored for each item and embedded in the page
+ITEM_FIELDS = ('id', 'name', 'node_name', 'type', 'color', 'id_event', 'display_group', 'flagged')
+# Item attributes the output can be sharded by, and the shard used for items without a value
+SHARD_ATTRIBUTES = ('display_group', 'id_event')
+SHARD_EMPTY_VALUE = '(none)'
+BOUNDARY_NODE_COLOR = '#7F8C8D'
+# Marker in the HTML template where the streamed data block is written
+EXPLORER_DATA_PLACEHOLDER = '<!-- EXPLORER_DATA -->'
+# Optional compressed outputs: .gz/.br siblings and a self-decompressing page
+COMPRESSED_OUTPUTS = ('gz', 'br', 'packed')
+COPY_CHUNK_SIZE = 1024 * 1024
+# SQLite graph store: file header used to recognise a database input, and IDs per IN (...) query
+SQLITE_HEADER = b'SQLite format 3\x00'
+SQLITE_BATCH_SIZE = 500
+# Columnar cache files written next to the CSV, and the schema metadata key holding the CSV digest
+CACHE_ITEMS_SUFFIX = '.items.arrow'
+CACHE_EDGES_SUFFIX = '.edges.arrow'
+CACHE_SOURCE_KEY = b'source_sha256'
+# Item search: marks a posting list packed as a bitmap instead of varint-encoded gaps
+SEARCH_BITMAP_PREFIX = '*'
+# Graph diff: node colors by change status (in precedence order) and the number of entries listed per section
+DIFF_STATUS_COLORS = {
+    'added': '#2ECC71',
+    'removed': '#E74C3C',
+    'modified': '#F39C12',
+    'rewired': '#F1C40F',
+    'context': '#7F8C8D'
+}
+DIFF_REPORT_LIMIT = 50
+# Item fields compared to decide whether an item present in both exports was modified
+DIFF_ITEM_FIELDS = ('name', 'type', 'id_event', 'display_group', 'flagged')
+# Hub pruning: default cap on new neighbours shown per node (0 = no limit), the page's cap choices,
+# how hidden neighbours are ranked, and the "+N more" node that stands in for them
+DEFAULT_MAX_FANOUT = 25
+FANOUT_CHOICES = (10, 25, 50, 100)
+FANOUT_RANKINGS = ('degree', 'flagged')
+SUMMARY_NODE_SUFFIX = '+more'
+SUMMARY_NODE_COLOR = '#BDC3C7'
 
 # --- Helper Functions ---
 def get_column_index(col_str):
@@ -39,15 +110,10 @@ def load_and_prepare_data(csv_file_path):
         df.reset_index(drop=True, inplace=True)
         df.rename(columns=COLUMN_MAP, inplace=True)
         
-        # Find the row with "BENEFIT ITEMS"
-        benefit_row = -1
-        for index, row in df.iterrows():
-            for col, value in row.items():
-                if isinstance(value, str) and "BENEFIT ITEMS" in value:
-                    benefit_row = index
-                    break
-            if benefit_row >= 0:
-                break
+        # Find the row with "BENEFIT ITEMS" (only text columns can hold it)
+        text_cols = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])]
+        has_marker = df[text_cols].apply(lambda col: col.astype(str).str.contains("BENEFIT ITEMS", regex=False)).any(axis=1)
+        benefit_row = has_marker.idxmax() if has_marker.any() else -1
         
         # If we found the BENEFIT ITEMS row, extract the header row and data
         if benefit_row >= 0:
@@ -62,11 +128,8 @@ def load_and_prepare_data(csv_file_path):
             df = df.iloc[data_start_index:].copy()
             
             # Find the first blank row after the data starts
-            blank_row = -1
-            for index, row in df.iterrows():
-                if row.isnull().all():
-                    blank_row = index
-                    break
+            is_blank = df.isnull().all(axis=1)
+            blank_row = is_blank.idxmax() if is_blank.any() else -1
             
             # If we found a blank row, filter to rows before it
             if blank_row >= 0:
@@ -124,12 +187,76 @@ def load_and_prepare_data(csv_file_path):
         traceback.print_exc()
         return None
 
-def build_relationship_graph(df, headers=None):
-    """Builds a complete relationship graph from the data."""
-    relationships = defaultdict(set)  # item_id -> set of dependent item_ids
-    reverse_relationships = defaultdict(set)  # item_id -> set of items it depends on
-    all_items = {}  # item_id -> item_info
+def clean_values(values):
+    """Returns values as stripped strings, with None where the cell is empty."""
+    return values.astype(str).str.strip().astype(object).where(values.notna(), None)
+
+def clean_column(df, col_idx):
+    """Returns a column by position as stripped strings, or all None if the column is missing."""
+    if col_idx is None or col_idx >= len(df.columns):
+        return pd.Series(None, index=df.index, dtype=object)
+    return clean_values(df.iloc[:, col_idx])
+
+def build_item_table(df, id_item_col=None, id_event_col=None, display_group_col=None, item_name_col=None):
+    """Builds the item table (one row per data row with an ID) with display names computed over whole columns.
+    
+    The dropdown name is id_item - id_event - display_group - item_name with empty and repeated
+    parts dropped, and the node label is the last remaining part.
+    """
+    # The canonical item_id prefers the detected 'id_item' column, falling back to 'ItemID' (col 0)
+    item_ids = clean_column(df, id_item_col)
+    item_ids = item_ids.where(item_ids.notna(), clean_values(df['ItemID'])).fillna('')
+    
+    # Fall back to the default ItemName from column 1 where there is no item_name value
+    item_names = clean_column(df, item_name_col)
+    item_names = item_names.where(item_names.notna(), clean_values(df['ItemName']))
+    
+    # A part is kept when it is non-empty and differs from every earlier part
+    events = clean_column(df, id_event_col)
+    groups = clean_column(df, display_group_col)
+    parts = [item_ids] + [part.fillna('') for part in (events, groups, item_names)]
+    names = item_ids.copy()
+    node_names = item_ids.copy()
+    for position, part in enumerate(parts[1:], start=1):
+        keep = part != ''
+        for earlier in parts[:position]:
+            keep &= part != earlier
+        names = names.where(~keep, names + ' - ' + part)
+        node_names = node_names.where(~keep, part)
     
+    item_types = df['ItemType']
+    items = pd.DataFrame({
+        'id': item_ids,
+        'name': names,
+        'node_name': node_names,
+        'type': item_types.astype(str).astype(object).where(item_types.notna(), 'Unknown'),
+        'color': item_types.astype(str).str.strip().map(NODE_COLOR_MAP).fillna(DEFAULT_NODE_COLOR),
+        'id_event': events.where(events != '', None),
+        'display_group': groups.where(groups != '', None),
+        'flagged': False
+    }, index=df.index)
+    
+    # Skip rows with no item_id
+    return items[items['id'] != '']
+
+def build_edge_table(df, item_ids, dependency_cols):
+    """Builds the (source, target) edge table: source is the dependency ID, target the item that depends on it."""
+    dependency_cols = [col_idx for col_idx in dependency_cols if col_idx < len(df.columns)]
+    values = df.iloc[:, dependency_cols].to_numpy(dtype=object)
+    
+    # Row-major positions of the filled cells keep the same order as reading row by row
+    row_pos, col_pos = pd.notna(values).nonzero()
+    deps = pd.Series(values[row_pos, col_pos], dtype=object).astype(str).str.strip()
+    
+    # Extract just the ID part (before the colon) if format is id:name
+    edges = pd.DataFrame({
+        'source': deps.str.split(':', n=1).str[0].astype(object),
+        'target': item_ids.to_numpy(dtype=object)[row_pos]
+    })
+    return edges[deps.to_numpy() != ''].reset_index(drop=True)
+
+def build_graph_tables(df, headers=None):
+    """Detects the item columns and builds the (items, edges) tables from the data."""
     # Get the column ranges for parsing dependencies
     col_start_1 = get_column_index(PARAMS1_COLS[0])
     col_end_1 = get_column_index(PARAMS1_COLS[1])
@@ -215,105 +342,113 @@ def build_relationship_graph(df, headers=None):
     print(f"\\nColumn mapping: id_item={id_item_col}, id_event={id_event_col}, display_group={display_group_col}, item_name={item_name_col}")
 
     
-    # Process each row
-    for index, row in df.iterrows():
-        # Determine the canonical item_id for this row. This will be the key for relationships.
-        # We prioritize the detected 'id_item' column, but fall back to the hardcoded 'ItemID' (col 0).
-        if id_item_col is not None and id_item_col < len(row) and pd.notna(row.iloc[id_item_col]):
-            item_id = str(row.iloc[id_item_col]).strip()
-        else:
-            item_id = str(row['ItemID']).strip()
-
-        # Skip rows with no item_id
-        if not item_id:
-            continue
+    # Build every item's names in one batched pass over whole columns
+    items = build_item_table(df, id_item_col, id_event_col, display_group_col, item_name_col)
+    
+    # Debug print for the first few items to verify the name assembly
+    for index, item in enumerate(items.head(5).itertuples(index=False)):
+        print(f"\n--- Item {index+1} ---")
+        print(f"  Canonical ID:    {item.id}")
+        print(f"  Dropdown Name:   {item.name}")
+        print(f"  Node Label:      {item.node_name}")
+    
+    # Process dependencies in both ranges (DF to HV, HW to MN)
+    dependency_cols = list(range(col_start_1, col_end_1 + 1)) + list(range(col_start_2, col_end_2 + 1))
+    edges = build_edge_table(df.loc[items.index], items['id'], dependency_cols)
+    
+    return items, edges
 
-        item_type = row['ItemType']
+def get_table_columns(table):
+    """Returns a DataFrame as a dict of column lists, with missing values as None."""
+    values = table.astype(object)
+    values = values.where(values.notna(), None)
+    return {column: values[column].tolist() for column in table.columns}
 
-        # --- Build the formatted name for display ---
-        # This name will be shown in the dropdown.
-        # The goal is: id_item - id_event - display_group - item_name
-        
-        formatted_name_parts = []
+def get_flagged_ids(items):
+    """Returns the IDs marked in the 'flagged' column of an items table."""
+    return {item_id for item_id, flagged in zip(items['id'], items['flagged']) if flagged}
 
-        # Part 1: id_item
-        # Use the value from the detected id_item_col, or the canonical item_id as a fallback.
-        if id_item_col is not None and id_item_col < len(row) and pd.notna(row.iloc[id_item_col]):
-             formatted_name_parts.append(str(row.iloc[id_item_col]).strip())
-        else:
-             formatted_name_parts.append(item_id)
-
-        # Part 2: id_event
-        if id_event_col is not None and id_event_col < len(row) and pd.notna(row.iloc[id_event_col]):
-            formatted_name_parts.append(str(row.iloc[id_event_col]).strip())
-
-        # Part 3: display_group
-        if display_group_col is not None and display_group_col < len(row) and pd.notna(row.iloc[display_group_col]):
-            formatted_name_parts.append(str(row.iloc[display_group_col]).strip())
-
-        # Part 4: item_name
-        if item_name_col is not None and item_name_col < len(row) and pd.notna(row.iloc[item_name_col]):
-            formatted_name_parts.append(str(row.iloc[item_name_col]).strip())
-        else:  # Fallback to default ItemName from column 1
-            default_item_name = row['ItemName']
-            if pd.notna(default_item_name):
-                formatted_name_parts.append(str(default_item_name).strip())
-        
-        # --- End of name building ---
-
-        # De-duplicate parts while preserving order, then join.
-        # This prevents issues like "12345 - 12345 - ..."
-        unique_parts = [p for p in formatted_name_parts if p] # Filter out empty strings
-        unique_parts = list(dict.fromkeys(unique_parts))
-        formatted_name = " - ".join(unique_parts)
-        
-        # For the node label in the graph, we want just the most descriptive part (usually the last one).
-        node_display_name = unique_parts[-1] if unique_parts else item_id
-        
-        # Debug print for the first few items to verify the new logic
-        if index < 5:
-            print(f"\n--- Item {index+1} ---")
-            print(f"  Canonical ID:    {item_id}")
-            print(f"  Raw Name Parts:  {formatted_name_parts}")
-            print(f"  Unique Parts:    {unique_parts}")
-            print(f"  Dropdown Name:   {formatted_name}")
-            print(f"  Node Label:      {node_display_name}")
-
-        # Store item information
-        all_items[item_id] = {
-            'id': item_id,
-            'name': formatted_name,
-            'node_name': node_display_name,
-            'type': str(item_type) if pd.notna(item_type) else 'Unknown',
-            'color': get_node_color(item_type)
-        }
-        
-        # Process dependencies in first range (DF to HV)
-        for col_idx in range(col_start_1, col_end_1 + 1):
-            if col_idx < len(row):
-                dep_value = row.iloc[col_idx]
-                if pd.notna(dep_value) and str(dep_value).strip() != '':
-                    dep_value = str(dep_value).strip()
-                    # Extract just the ID part (before the colon) if format is id:name
-                    dep_id = dep_value.split(':')[0] if ':' in dep_value else dep_value
-                    relationships[dep_id].add(item_id)
-                    reverse_relationships[item_id].add(dep_id)
-        
-        # Process dependencies in second range (HW to MN)
-        for col_idx in range(col_start_2, col_end_2 + 1):
-            if col_idx < len(row):
-                dep_value = row.iloc[col_idx]
-                if pd.notna(dep_value) and str(dep_value).strip() != '':
-                    dep_value = str(dep_value).strip()
-                    # Extract just the ID part (before the colon) if format is id:name
-                    dep_id = dep_value.split(':')[0] if ':' in dep_value else dep_value
-                    relationships[dep_id].add(item_id)
-                    reverse_relationships[item_id].add(dep_id)
+def graph_from_tables(items, edges):
+    """Builds the (relationships, reverse_relationships, all_items) dicts from the items and edges column tables."""
+    relationships = defaultdict(set)  # item_id -> set of dependent item_ids
+    reverse_relationships = defaultdict(set)  # item_id -> set of items it depends on
+    all_items = {}  # item_id -> item_info
+    
+    # Store item information; like per-row assignment, a repeated ID keeps its first position but the last row's values
+    for row in zip(*(items[field] for field in ITEM_FIELDS)):
+        all_items[row[0]] = dict(zip(ITEM_FIELDS, row))
+    
+    for dep_id, item_id in zip(edges['source'], edges['target']):
+        relationships[dep_id].add(item_id)
+        reverse_relationships[item_id].add(dep_id)
     
     return relationships, reverse_relationships, all_items
 
-def get_related_items(item_id, relationships, reverse_relationships, all_items, max_depth=2):
-    """Gets all items related to the given item_id up to max_depth levels."""
+def build_relationship_graph(df, headers=None):
+    """Builds a complete relationship graph from the data."""
+    items, edges = build_graph_tables(df, headers)
+    return graph_from_tables(get_table_columns(items), get_table_columns(edges))
+
+def get_neighbour_relevance(item_id, relationships, reverse_relationships, all_items, rank_by='degree'):
+    """Sort key for fan-out pruning: most connected items first, flagged items ahead of them with rank_by='flagged'."""
+    degree = len(relationships.get(item_id, ())) + len(reverse_relationships.get(item_id, ()))
+    if rank_by == 'flagged':
+        return bool(all_items[item_id].get('flagged')), degree
+    return (degree,)
+
+def create_summary_node(parent_id, hidden_ids, depth):
+    """Builds the "+N more" node standing in for the neighbours of parent_id hidden by fan-out pruning."""
+    label = f"+{len(hidden_ids)} more"
+    return {
+        'id': f"{parent_id}{SUMMARY_NODE_SUFFIX}",
+        'name': label,
+        'node_name': label,
+        'type': 'Hidden neighbours',
+        'color': SUMMARY_NODE_COLOR,
+        'depth': depth,
+        'parent_id': parent_id,
+        'hidden_ids': hidden_ids
+    }
+
+def add_neighbours(current_id, depth, dep_ids, dependent_ids, visited, nodes, edges, max_fanout=None, relevance=None):
+    """Adds the unvisited neighbours of current_id to a BFS result and returns the IDs to visit next.
+    
+    With max_fanout, only the max_fanout most relevant new neighbours (by the relevance sort key)
+    are kept; the rest are collapsed into a single "+N more" summary node linked to current_id.
+    Neighbours are taken in ID order, so the result does not depend on set or SQL row order.
+    """
+    # Dependencies first; an item that is both keeps its dependency edge
+    new_neighbours = {}
+    for dep_id in sorted(dep_ids):
+        if dep_id not in visited:
+            new_neighbours.setdefault(dep_id, (dep_id, current_id))
+    for dependent_id in sorted(dependent_ids):
+        if dependent_id not in visited:
+            new_neighbours.setdefault(dependent_id, (current_id, dependent_id))
+    
+    shown = list(new_neighbours)
+    hidden = []
+    if max_fanout is not None and 0 < max_fanout < len(shown):
+        # sorted() is stable, so equally relevant neighbours are ordered by ID
+        ranked = sorted(sorted(shown), key=relevance, reverse=True)
+        shown, hidden = ranked[:max_fanout], ranked[max_fanout:]
+    
+    for neighbour_id in shown:
+        visited.add(neighbour_id)
+        edges.append(new_neighbours[neighbour_id])
+    if hidden:
+        summary = create_summary_node(current_id, hidden, depth + 1)
+        nodes.append(summary)
+        edges.append((current_id, summary['id']))
+    return shown
+
+def get_related_items(item_id, relationships, reverse_relationships, all_items, max_depth=2, max_fanout=None,
+                      rank_by='degree'):
+    """Gets all items related to the given item_id up to max_depth levels.
+    
+    With max_fanout, each node shows at most max_fanout new neighbours, ranked by rank_by
+    ('degree' or 'flagged'), and the rest are summarized in a "+N more" node.
+    """
     if item_id not in all_items:
         return [], []
     
@@ -321,6 +456,9 @@ def get_related_items(item_id, relationships, reverse_relationships, all_items,
     nodes = []
     edges = []
     
+    def relevance(neighbour_id):
+        return get_neighbour_relevance(neighbour_id, relationships, reverse_relationships, all_items, rank_by)
+    
     # BFS to find related items
     queue = deque([(item_id, 0)])  # (item_id, depth)
     visited.add(item_id)
@@ -335,47 +473,345 @@ def get_related_items(item_id, relationships, reverse_relationships, all_items,
             nodes.append(node_info)
         
         if depth < max_depth:
-            # Process items this depends on
-            for dep_id in reverse_relationships.get(current_id, []):
-                if dep_id not in visited and dep_id in all_items:
-                    visited.add(dep_id)
-                    queue.append((dep_id, depth + 1))
-                    edges.append((dep_id, current_id))
-            
-            # Process items that depend on this
-            for dependent_id in relationships.get(current_id, []):
-                if dependent_id not in visited and dependent_id in all_items:
-                    visited.add(dependent_id)
-                    queue.append((dependent_id, depth + 1))
-                    edges.append((current_id, dependent_id))
+            # Items this depends on, then items that depend on this
+            dep_ids = [dep_id for dep_id in reverse_relationships.get(current_id, []) if dep_id in all_items]
+            dependent_ids = [dependent_id for dependent_id in relationships.get(current_id, []) if dependent_id in all_items]
+            for neighbour_id in add_neighbours(current_id, depth, dep_ids, dependent_ids, visited, nodes, edges,
+                                               max_fanout, relevance):
+                queue.append((neighbour_id, depth + 1))
     
     return nodes, edges
 
-def get_node_color(item_type):
-    """Returns a color based on the item type."""
-    color_map = {
-        'Component': '#FF6B6B',
-        'Service': '#4ECDC4',
-        'Database': '#45B7D1',
-        'API': '#96CEB4',
-        'Interface': '#FFEAA7',
-        'Process': '#DDA0DD',
-        'System': '#98D8C8'
-    }
+# --- SQLite Graph Store ---
+def is_sqlite_file(file_path):
+    """Returns True if file_path is an SQLite database (e.g. one written with --sqlite)."""
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+def iter_batches(values, size=SQLITE_BATCH_SIZE):
+    """Yields successive lists of at most `size` values."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def connect_sqlite_readonly(db_file):
+    """Opens an SQLite database read-only; the path is turned into a URI so spaces, '#' and '%' are escaped."""
+    return sqlite3.connect(pathlib.Path(db_file).resolve().as_uri() + '?mode=ro', uri=True)
+
+def save_graph_to_sqlite(db_file, relationships, reverse_relationships, all_items):
+    """Writes items and edges into an indexed SQLite database, replacing any graph already stored there.
     
-    if pd.isna(item_type):
-        return '#97C2FC'
+    The database is built in a temporary file next to db_file and moved into place once complete,
+    so an interrupted save never leaves a partial store behind.
+    """
+    columns = ', '.join(ITEM_FIELDS)
+    column_defs = ', '.join(f"{field} {'INTEGER' if field == 'flagged' else 'TEXT'}" for field in ITEM_FIELDS[1:])
+    temp_file = f"{db_file}.tmp"
+    if os.path.exists(temp_file):
+        os.remove(temp_file)
     
-    item_type_str = str(item_type).strip()
-    return color_map.get(item_type_str, '#97C2FC')
+    conn = sqlite3.connect(temp_file)
+    try:
+        # No journal needed: the temporary file is discarded if anything goes wrong
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        with conn:
+            conn.execute(f'CREATE TABLE items ({ITEM_FIELDS[0]} TEXT PRIMARY KEY, {column_defs})')
+            # source is the dependency, target the item that depends on it; the primary key indexes source -> target
+            conn.execute('CREATE TABLE edges (source TEXT NOT NULL, target TEXT NOT NULL, PRIMARY KEY (source, target)) WITHOUT ROWID')
+            
+            conn.executemany(
+                f'INSERT INTO items ({columns}) VALUES ({", ".join("?" for _ in ITEM_FIELDS)})',
+                ([item[field] for field in ITEM_FIELDS] for item in all_items.values())
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO edges (source, target) VALUES (?, ?)',
+                ((dep_id, item_id) for dep_id, dependents in relationships.items() for item_id in dependents)
+            )
+            # Index the reverse direction after the bulk insert
+            conn.execute('CREATE INDEX edges_by_target ON edges (target, source)')
+        
+        item_count = conn.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+        edge_count = conn.execute('SELECT COUNT(*) FROM edges').fetchone()[0]
+        conn.close()
+        os.replace(temp_file, db_file)
+    except BaseException:
+        conn.close()
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    
+    print(f"Saved {item_count} items and {edge_count} relationships to SQLite database '{db_file}'")
 
-def generate_web_interface(csv_file_path, output_file_name):
-    """Generates an interactive web interface for exploring the network."""
+def get_item_columns_sqlite(conn):
+    """Returns the SELECT list for ITEM_FIELDS, using NULL for fields missing from databases saved by older versions."""
+    stored = {row[1] for row in conn.execute('PRAGMA table_info(items)')}
+    return ', '.join(field if field in stored else f'NULL AS {field}' for field in ITEM_FIELDS)
+
+def load_graph_from_sqlite(db_file):
+    """Loads the (relationships, reverse_relationships, all_items) graph from an SQLite database."""
+    conn = connect_sqlite_readonly(db_file)
+    try:
+        all_items = {
+            row[0]: dict(zip(ITEM_FIELDS, row))
+            for row in conn.execute(f'SELECT {get_item_columns_sqlite(conn)} FROM items ORDER BY rowid')
+        }
+        relationships = defaultdict(set)
+        reverse_relationships = defaultdict(set)
+        for dep_id, item_id in conn.execute('SELECT source, target FROM edges'):
+            relationships[dep_id].add(item_id)
+            reverse_relationships[item_id].add(dep_id)
+    finally:
+        conn.close()
+    
+    print(f"Loaded {len(all_items)} items from SQLite database '{db_file}'")
+    return relationships, reverse_relationships, all_items
+
+def fetch_items_sqlite(conn, item_ids):
+    """Returns {item_id: item_info} for the given IDs that exist in the store."""
+    found = {}
+    columns = get_item_columns_sqlite(conn)
+    for batch in iter_batches(item_ids):
+        placeholders = ', '.join('?' for _ in batch)
+        for row in conn.execute(f'SELECT {columns} FROM items WHERE id IN ({placeholders})', batch):
+            found[row[0]] = dict(zip(ITEM_FIELDS, row))
+    return found
+
+def fetch_neighbours_sqlite(conn, item_ids, from_col, to_col):
+    """Returns {item_id: [neighbour ids]} following edges from `from_col` to `to_col`, skipping unknown items."""
+    neighbours = defaultdict(list)
+    for batch in iter_batches(item_ids):
+        placeholders = ', '.join('?' for _ in batch)
+        query = (
+            f'SELECT e.{from_col}, e.{to_col} FROM edges e JOIN items i ON i.id = e.{to_col} '
+            f'WHERE e.{from_col} IN ({placeholders})'
+        )
+        for current_id, neighbour_id in conn.execute(query, batch):
+            neighbours[current_id].append(neighbour_id)
+    return neighbours
+
+def fetch_degrees_sqlite(conn, item_ids):
+    """Returns {item_id: number of relationships in either direction} for the given IDs."""
+    degrees = dict.fromkeys(item_ids, 0)
+    for batch in iter_batches(item_ids):
+        placeholders = ', '.join('?' for _ in batch)
+        for column in ('source', 'target'):
+            for found_id, count in conn.execute(
+                f'SELECT {column}, COUNT(*) FROM edges WHERE {column} IN ({placeholders}) GROUP BY {column}', batch
+            ):
+                degrees[found_id] += count
+    return degrees
+
+def get_related_items_sqlite(conn, item_id, max_depth=2, max_fanout=None, rank_by='degree'):
+    """Gets all items related to the given item_id up to max_depth levels from an SQLite graph store.
+    
+    Same result as get_related_items, but each BFS level is answered with batched indexed
+    queries, so memory only grows with the size of the result.
+    """
+    if not fetch_items_sqlite(conn, [item_id]):
+        return [], []
+    
+    visited = {item_id}
+    nodes = []
+    edges = []
+    frontier = [item_id]
+    depth = 0
+    
+    while frontier:
+        # Add the nodes of this level
+        frontier_items = fetch_items_sqlite(conn, frontier)
+        for current_id in frontier:
+            node_info = frontier_items[current_id]
+            node_info['depth'] = depth
+            nodes.append(node_info)
+        
+        if depth >= max_depth:
+            break
+        
+        # Items these depend on, and items that depend on these
+        deps = fetch_neighbours_sqlite(conn, frontier, 'target', 'source')
+        dependents = fetch_neighbours_sqlite(conn, frontier, 'source', 'target')
+        
+        # Fan-out pruning ranks the level's candidate neighbours by degree (and flag), fetched in batches
+        relevance = None
+        if max_fanout is not None and max_fanout > 0:
+            candidates = list({
+                neighbour_id
+                for neighbours in (*deps.values(), *dependents.values())
+                for neighbour_id in neighbours
+            } - visited)
+            degrees = fetch_degrees_sqlite(conn, candidates)
+            flags = fetch_items_sqlite(conn, candidates) if rank_by == 'flagged' else {}
+            
+            def relevance(neighbour_id):
+                if rank_by == 'flagged':
+                    return bool(flags[neighbour_id]['flagged']), degrees[neighbour_id]
+                return (degrees[neighbour_id],)
+        
+        next_frontier = []
+        for current_id in frontier:
+            next_frontier.extend(add_neighbours(
+                current_id, depth, deps.get(current_id, []), dependents.get(current_id, []), visited, nodes, edges,
+                max_fanout, relevance
+            ))
+        
+        frontier = next_frontier
+        depth += 1
+    
+    return nodes, edges
+
+def print_related_items(item_id, nodes, edges, max_depth):
+    """Prints the result of a related-items query."""
+    if not nodes:
+        print(f"Item '{item_id}' was not found")
+        return
+    
+    print(f"\nItems related to '{item_id}' (depth {max_depth}): {len(nodes)} items, {len(edges)} relationships")
+    for node in nodes:
+        print(f"  [{node['depth']}] {node['name']} ({node['type']})")
+    print("Relationships (dependency -> dependent):")
+    for dep_id, dependent_id in edges:
+        print(f"  {dep_id} -> {dependent_id}")
+
+# --- Columnar Cache ---
+def get_cache_paths(csv_file_path):
+    """Returns the (items, edges) Arrow IPC cache paths for a CSV file."""
+    root, _ = os.path.splitext(csv_file_path)
+    return root + CACHE_ITEMS_SUFFIX, root + CACHE_EDGES_SUFFIX
+
+def write_columnar_cache(csv_file_path, items, edges, digest):
+    """Writes the extracted item metadata and edge tables as uncompressed Arrow IPC (Feather) files.
+    
+    digest is the SHA-256 of the CSV as it was before parsing, so a file saved mid-parse
+    never gets a cache labelled with its new contents.
+    """
+    if pa is None:
+        print("Warning: Skipping the columnar cache, install the 'pyarrow' package to enable it")
+        return
+    
+    metadata = {CACHE_SOURCE_KEY: digest.encode('ascii')}
+    for table, cache_file in zip((items, edges), get_cache_paths(csv_file_path)):
+        arrow_table = pa.table(table).replace_schema_metadata(metadata)
+        # Uncompressed so the file can be memory-mapped and read without decoding
+        feather.write_feather(arrow_table, cache_file, compression='uncompressed')
+    
+    print(f"Wrote columnar cache: '{get_cache_paths(csv_file_path)[0]}', '{get_cache_paths(csv_file_path)[1]}'")
+
+def load_columnar_cache(csv_file_path, digest):
+    """Memory-maps the cached (items, edges) tables for a CSV, or returns None if missing or out of date.
+    
+    The tables are returned as column lists read straight from the Arrow columns, skipping pandas.
+    """
+    if pa is None:
+        return None
+    
+    cache_files = get_cache_paths(csv_file_path)
+    if not all(os.path.exists(cache_file) for cache_file in cache_files):
+        return None
+    
+    digest = digest.encode('ascii')
+    required_columns = {CACHE_ITEMS_SUFFIX: set(ITEM_FIELDS), CACHE_EDGES_SUFFIX: {'source', 'target'}}
+    tables = []
+    for cache_file in cache_files:
+        with pa.memory_map(cache_file, 'r') as source:
+            arrow_table = pa.ipc.open_file(source).read_all()
+            columns = required_columns[CACHE_ITEMS_SUFFIX if cache_file.endswith(CACHE_ITEMS_SUFFIX) else CACHE_EDGES_SUFFIX]
+            if (arrow_table.schema.metadata or {}).get(CACHE_SOURCE_KEY) != digest or not columns <= set(arrow_table.column_names):
+                print(f"Columnar cache '{cache_file}' is out of date, re-reading the CSV")
+                return None
+            tables.append({column: arrow_table.column(column).to_pylist() for column in columns})
+    
+    print(f"Loaded {len(tables[0]['id'])} items and {len(tables[1]['source'])} relationships from the columnar cache")
+    return tuple(tables)
+
+def find_flagged_items(df, item_ids):
+    """Returns the IDs of items where actuarial_liability, payment_risk or payment_insured = 1."""
+    # Find columns for actuarial_liability, payment_risk, payment_insured
+    actuarial_col = None
+    payment_risk_col = None
+    payment_insured_col = None
+    
+    for col in df.columns:
+        col_values = df[col].astype(str).str.lower()
+        if col_values.str.contains('actuarial_liability', na=False).any():
+            actuarial_col = col + 1 if col + 1 in df.columns else None
+        elif col_values.str.contains('payment_risk', na=False).any():
+            payment_risk_col = col + 1 if col + 1 in df.columns else None
+        elif col_values.str.contains('payment_insured', na=False).any():
+            payment_insured_col = col + 1 if col + 1 in df.columns else None
+    
+    # Find rows where any of these flags = 1
+    is_flagged = pd.Series(False, index=df.index)
+    for flag_col in (actuarial_col, payment_risk_col, payment_insured_col):
+        if flag_col and flag_col < len(df.columns):
+            is_flagged |= df.iloc[:, flag_col].astype(str).str.strip() == '1'
+    
+    flagged_items = set(df['ItemID'].astype(str).str.strip()[is_flagged]).intersection(item_ids)
+    print(f"Found {len(flagged_items)} items with actuarial/payment flags")
+    return flagged_items
+
+def filter_connected_items(relationships, reverse_relationships, all_items, flagged_items):
+    """Keeps only items with a direct or indirect relationship to one of the flagged items."""
+    # Find all items that have relationships (direct or indirect) with flagged items
+    def find_connected_items(start_items, relationships, reverse_relationships, max_depth=10):
+        connected = set(start_items)
+        queue = deque([(item, 0) for item in start_items])
+        
+        while queue:
+            current_item, depth = queue.popleft()
+            if depth >= max_depth:
+                continue
+            
+            # Add items this depends on
+            for dep in reverse_relationships.get(current_item, []):
+                if dep not in connected and dep in all_items:
+                    connected.add(dep)
+                    queue.append((dep, depth + 1))
+            
+            # Add items that depend on this
+            for dependent in relationships.get(current_item, []):
+                if dependent not in connected and dependent in all_items:
+                    connected.add(dependent)
+                    queue.append((dependent, depth + 1))
+        
+        return connected
+    
+    if flagged_items:
+        connected_items = find_connected_items(flagged_items, relationships, reverse_relationships)
+        print(f"Found {len(connected_items)} items connected to actuarial/payment items")
+        
+        # Filter all_items, relationships, and reverse_relationships
+        filtered_all_items = {k: v for k, v in all_items.items() if k in connected_items}
+        filtered_relationships = {k: v.intersection(connected_items) for k, v in relationships.items() if k in connected_items}
+        filtered_reverse_relationships = {k: v.intersection(connected_items) for k, v in reverse_relationships.items() if k in connected_items}
+        
+        # Remove empty relationships
+        filtered_relationships = {k: v for k, v in filtered_relationships.items() if v}
+        filtered_reverse_relationships = {k: v for k, v in filtered_reverse_relationships.items() if v}
+        
+        return filtered_relationships, filtered_reverse_relationships, filtered_all_items
+    else:
+        print("No actuarial/payment flagged items found, keeping all items")
+        return relationships, reverse_relationships, all_items
+
+def load_graph_tables(csv_file_path, use_cache=False, digest=None):
+    """Returns the (items, edges) column tables for a CSV, with a 'flagged' column marking actuarial/payment items.
+    
+    With use_cache, an up-to-date columnar cache is used instead of parsing the CSV,
+    and a new cache is written after parsing. digest is the CSV's SHA-256 if the caller already has it.
+    """
+    if use_cache:
+        digest = digest or get_file_digest(csv_file_path)
+        tables = load_columnar_cache(csv_file_path, digest)
+        if tables is not None:
+            return tables
     
     # Load and process data
     result = load_and_prepare_data(csv_file_path)
     if result is None:
-        return
+        return None
     
     # Handle both old return format (just df) and new format (df, headers)
     if isinstance(result, tuple):
@@ -383,106 +819,191 @@ def generate_web_interface(csv_file_path, output_file_name):
     else:
         df, headers = result, None
     
-    relationships, reverse_relationships, all_items = build_relationship_graph(df, headers)
+    items, edges = build_graph_tables(df, headers)
+    items['flagged'] = items['id'].isin(find_flagged_items(df, items['id']))
+    items, edges = get_table_columns(items), get_table_columns(edges)
     
-    # Advanced filtering: Keep only items that have relationships with items where actuarial_liability OR payment_risk OR payment_insured = 1
-    def filter_by_actuarial_payment_relationships(relationships, reverse_relationships, all_items, df):
-        # Find columns for actuarial_liability, payment_risk, payment_insured
-        actuarial_col = None
-        payment_risk_col = None
-        payment_insured_col = None
-        
-        for col in df.columns:
-            col_values = df[col].astype(str).str.lower()
-            if any(col_values.str.contains('actuarial_liability', na=False)):
-                actuarial_col = col + 1 if col + 1 in df.columns else None
-            elif any(col_values.str.contains('payment_risk', na=False)):
-                payment_risk_col = col + 1 if col + 1 in df.columns else None
-            elif any(col_values.str.contains('payment_insured', na=False)):
-                payment_insured_col = col + 1 if col + 1 in df.columns else None
-        
-        # Find items where any of these flags = 1
-        flagged_items = set()
-        for index, row in df.iterrows():
-            item_id = str(row['ItemID']).strip()
-            if item_id in all_items:
-                is_flagged = False
-                
-                # Check actuarial_liability
-                if actuarial_col and actuarial_col < len(row):
-                    if str(row.iloc[actuarial_col]).strip() == '1':
-                        is_flagged = True
-                
-                # Check payment_risk
-                if payment_risk_col and payment_risk_col < len(row):
-                    if str(row.iloc[payment_risk_col]).strip() == '1':
-                        is_flagged = True
-                
-                # Check payment_insured
-                if payment_insured_col and payment_insured_col < len(row):
-                    if str(row.iloc[payment_insured_col]).strip() == '1':
-                        is_flagged = True
-                
-                if is_flagged:
-                    flagged_items.add(item_id)
-        
-        print(f"Found {{len(flagged_items)}} items with actuarial/payment flags")
-        
-        # Find all items that have relationships (direct or indirect) with flagged items
-        def find_connected_items(start_items, relationships, reverse_relationships, max_depth=10):
-            connected = set(start_items)
-            queue = deque([(item, 0) for item in start_items])
-            
-            while queue:
-                current_item, depth = queue.popleft()
-                if depth >= max_depth:
-                    continue
-                
-                # Add items this depends on
-                for dep in reverse_relationships.get(current_item, []):
-                    if dep not in connected and dep in all_items:
-                        connected.add(dep)
-                        queue.append((dep, depth + 1))
-                
-                # Add items that depend on this
-                for dependent in relationships.get(current_item, []):
-                    if dependent not in connected and dependent in all_items:
-                        connected.add(dependent)
-                        queue.append((dependent, depth + 1))
-            
-            return connected
-        
-        if flagged_items:
-            connected_items = find_connected_items(flagged_items, relationships, reverse_relationships)
-            print(f"Found {{len(connected_items)}} items connected to actuarial/payment items")
-            
-            # Filter all_items, relationships, and reverse_relationships
-            filtered_all_items = {{k: v for k, v in all_items.items() if k in connected_items}}
-            filtered_relationships = {{k: v.intersection(connected_items) for k, v in relationships.items() if k in connected_items}}
-            filtered_reverse_relationships = {{k: v.intersection(connected_items) for k, v in reverse_relationships.items() if k in connected_items}}
-            
-            # Remove empty relationships
-            filtered_relationships = {{k: v for k, v in filtered_relationships.items() if v}}
-            filtered_reverse_relationships = {{k: v for k, v in filtered_reverse_relationships.items() if v}}
-            
-            return filtered_relationships, filtered_reverse_relationships, filtered_all_items
-        else:
-            print("No actuarial/payment flagged items found, keeping all items")
-            return relationships, reverse_relationships, all_items
+    if use_cache:
+        write_columnar_cache(csv_file_path, items, edges, digest)
+    return items, edges
+
+def build_network_data(csv_file_path, use_cache=False, digest=None):
+    """Loads the CSV and returns the filtered (relationships, reverse_relationships, all_items) graph."""
+    
+    # A saved SQLite graph is already filtered and can be opened without any parsing
+    if is_sqlite_file(csv_file_path):
+        return load_graph_from_sqlite(csv_file_path)
+    
+    tables = load_graph_tables(csv_file_path, use_cache, digest)
+    if tables is None:
+        return None
+    
+    items, edges = tables
+    relationships, reverse_relationships, all_items = graph_from_tables(items, edges)
     
     # Apply the advanced filtering
-    relationships, reverse_relationships, all_items = filter_by_actuarial_payment_relationships(
-        relationships, reverse_relationships, all_items, df
-    )
+    flagged_items = get_flagged_ids(items)
+    return filter_connected_items(relationships, reverse_relationships, all_items, flagged_items)
+
+def generate_web_interface(csv_file_path, output_file_name, compress=(), sqlite_file=None, use_cache=False,
+                           shard_by=None, jobs=None, max_fanout=DEFAULT_MAX_FANOUT, rank_by='degree'):
+    """Generates an interactive web interface for exploring the network."""
+    graph = build_network_data(csv_file_path, use_cache)
+    if graph is None:
+        return None
+    
+    if sqlite_file:
+        save_graph_to_sqlite(sqlite_file, *graph)
+    
+    write_explorer_output(graph, output_file_name, compress, shard_by, jobs, max_fanout, rank_by)
+    return graph
+
+# --- Search Index ---
+def normalize_search_text(text):
+    """Lowercases text and collapses every run of non-alphanumeric characters to one space.
+    
+    Must match normalizeSearchText() in the page so queries produce the same trigrams.
+    """
+    return re.sub(r'[^a-z0-9]+', ' ', str(text).lower()).strip()
+
+def encode_postings(positions, item_count):
+    """Packs ascending item positions into a base64 string for the page to decode on first use.
+    
+    Gaps between positions are written as LEB128 varints (one byte each for most lists); lists
+    covering a large share of the items are written as a bitmap instead, marked by SEARCH_BITMAP_PREFIX.
+    """
+    gaps = bytearray()
+    previous = 0
+    for position in positions:
+        gap = position - previous
+        while gap >= 0x80:
+            gaps.append(gap & 0x7F | 0x80)
+            gap >>= 7
+        gaps.append(gap)
+        previous = position
+    
+    if len(gaps) <= (item_count + 7) // 8:
+        return base64.b64encode(gaps).decode('ascii')
+    
+    bitmap = bytearray((item_count + 7) // 8)
+    for position in positions:
+        bitmap[position >> 3] |= 1 << (position & 7)
+    return SEARCH_BITMAP_PREFIX + base64.b64encode(bitmap).decode('ascii')
+
+def build_search_index(item_options):
+    """Builds a trigram inverted index over item IDs, names and types for the page's fuzzy search.
+    
+    Maps each trigram of ' <normalized text> ' to the positions of matching items in item_options,
+    packed with encode_postings() so the index stays a small share of the page.
+    """
+    postings = defaultdict(list)
+    for position, item in enumerate(item_options):
+        text = ' ' + normalize_search_text(f"{item['id']} {item['name']} {item['type']}") + ' '
+        for trigram in {text[i:i + 3] for i in range(len(text) - 2)}:
+            postings[trigram].append(position)
+    
+    return {
+        trigram: encode_postings(positions, len(item_options))
+        for trigram, positions in sorted(postings.items())
+    }
+
+def iter_json_object(mapping, encode):
+    """Yields a JSON object one key/value pair at a time."""
+    yield '{'
+    for index, (key, value) in enumerate(mapping.items()):
+        yield ('' if index == 0 else ',') + encode(key) + ':' + encode(value)
+    yield '}'
+
+def iter_json_array(values, encode):
+    """Yields a JSON array one element at a time."""
+    yield '['
+    for index, value in enumerate(values):
+        yield ('' if index == 0 else ',') + encode(value)
+    yield ']'
+
+def iter_payload_chunks(relationships, reverse_relationships, all_items, item_options, search_index):
+    """Yields the compact JSON data payload embedded in the explorer page, in small chunks."""
+    # Sets are written as sorted arrays, so the page is the same on every run and its traversal
+    # visits neighbours in ID order like get_related_items; compact separators keep the payload small
+    encode = json.JSONEncoder(separators=(',', ':'), default=sorted).encode
+    yield '{"allItems":'
+    yield from iter_json_object(all_items, encode)
+    yield ',"relationships":'
+    yield from iter_json_object(relationships, encode)
+    yield ',"reverseRelationships":'
+    yield from iter_json_object(reverse_relationships, encode)
+    yield ',"itemOptions":'
+    yield from iter_json_array(item_options, encode)
+    yield ',"searchIndex":'
+    yield from iter_json_object(search_index, encode)
+    yield '}'
+
+def warn_missing_brotli(compressed_name):
+    """Prints the warning for a .br output skipped because the optional brotli package is missing."""
+    print(f"Warning: Skipping '{compressed_name}', install the 'brotli' package to write Brotli output")
+
+def write_compressed_copy(file_name, fmt, verbose=True):
+    """Writes a precompressed .gz or .br sibling of file_name for web servers that serve them directly."""
+    compressed_name = f"{file_name}.{fmt}"
+    if fmt == 'br' and brotli is None:
+        if verbose:
+            warn_missing_brotli(compressed_name)
+        return
+    
+    with open(file_name, 'rb') as src:
+        if fmt == 'gz':
+            with gzip.open(compressed_name, 'wb', compresslevel=9) as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+        else:
+            compressor = brotli.Compressor(mode=brotli.MODE_TEXT)
+            with open(compressed_name, 'wb') as dst:
+                for chunk in iter(lambda: src.read(COPY_CHUNK_SIZE), b''):
+                    dst.write(compressor.process(chunk))
+                dst.write(compressor.finish())
+    
+    if verbose:
+        print(f"Wrote compressed copy: '{compressed_name}' ({os.path.getsize(compressed_name):,} bytes)")
+
+def write_self_decompressing_page(html_head, html_tail, payload_chunks, output_file_name, verbose=True):
+    """Writes a variant of the page whose data block is gzip + base64 and is unpacked by the browser."""
+    root, ext = os.path.splitext(output_file_name)
+    packed_name = f"{root}.packed{ext or '.html'}"
+    
+    # gzip container (wbits=31) so the browser's DecompressionStream('gzip') can read it
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    pending = b''
+    with open(packed_name, 'w', encoding='utf-8') as f:
+        f.write(html_head)
+        f.write('<script type="application/octet-stream" id="explorerData" data-encoding="gzip">')
+        for chunk in payload_chunks:
+            pending += compressor.compress(chunk.encode('utf-8'))
+            # Only encode whole 3-byte groups so the base64 stream has no padding mid-way
+            cut = len(pending) - len(pending) % 3
+            f.write(base64.b64encode(pending[:cut]).decode('ascii'))
+            pending = pending[cut:]
+        f.write(base64.b64encode(pending + compressor.flush()).decode('ascii'))
+        f.write('</script>')
+        f.write(html_tail)
+    
+    if verbose:
+        print(f"Wrote self-decompressing page: '{packed_name}' ({os.path.getsize(packed_name):,} bytes)")
 
+def write_web_interface(relationships, reverse_relationships, all_items, output_file_name, compress=(), verbose=True,
+                        max_fanout=DEFAULT_MAX_FANOUT, rank_by='degree'):
+    """Writes the explorer HTML page for an already built relationship graph.
+    
+    max_fanout and rank_by set the page's initial hub pruning settings, which can be changed in the page.
+    """
+    
     # Debug: Print first 5 items and their relationships
-    print("Sample of items and their relationships:")
-    for idx, item_id in enumerate(list(all_items.keys())[:5]):
-        deps = reverse_relationships.get(item_id, set())
-        dependents = relationships.get(item_id, set())
-        print(f"ItemID: {item_id} | Depends on: {list(deps)} | Dependents: {list(dependents)}")
-    print(f"Total items: {len(all_items)}")
-    print(f"Total relationships: {sum(len(v) for v in relationships.values())}")
+    if verbose:
+        print("Sample of items and their relationships:")
+        for idx, item_id in enumerate(list(all_items.keys())[:5]):
+            deps = reverse_relationships.get(item_id, set())
+            dependents = relationships.get(item_id, set())
+            print(f"ItemID: {item_id} | Depends on: {list(deps)} | Dependents: {list(dependents)}")
+        print(f"Total items: {len(all_items)}")
+        print(f"Total relationships: {sum(len(v) for v in relationships.values())}")
 
     # Get list of all item IDs for the dropdown
     item_list = sorted(all_items.keys())
@@ -495,12 +1016,21 @@ def generate_web_interface(csv_file_path, output_file_name):
             'name': item_info['name'],
             'type': item_info['type']
         })
+    search_index = build_search_index(item_options)
     
-    # Convert data to JSON for embedding
-    all_items_json = json.dumps(all_items)
-    relationships_json = json.dumps({k: list(v) for k, v in relationships.items()})
-    reverse_relationships_json = json.dumps({k: list(v) for k, v in reverse_relationships.items()})
-    item_options_json = json.dumps(item_options, indent=2)
+    # Hub pruning controls, starting from the command line settings
+    # A cap of 0 or less means no limit
+    max_fanout = max(max_fanout or 0, 0)
+    fanout_choices = sorted((set(FANOUT_CHOICES) | {max_fanout}) - {0})
+    fanout_options = "\n                    ".join(
+        [f'<option value="{n}"{" selected" if n == max_fanout else ""}>{n} per node</option>' for n in fanout_choices]
+        + [f'<option value="0"{" selected" if not max_fanout else ""}>No limit</option>']
+    )
+    rank_labels = {'degree': 'Most connected', 'flagged': 'Flagged items first'}
+    rank_options = "\n                    ".join(
+        f'<option value="{ranking}"{" selected" if ranking == rank_by else ""}>{rank_labels[ranking]}</option>'
+        for ranking in FANOUT_RANKINGS
+    )
     
     html_template = f"""<!DOCTYPE html>
 <html>
@@ -553,6 +1083,27 @@ def generate_web_interface(csv_file_path, output_file_name):
             max-width: 400px;
         }}
         
+        .search-box {{
+            position: relative;
+            max-width: 400px;
+            margin-bottom: 10px;
+        }}
+        
+        .search-results {{
+            display: none;
+            position: absolute;
+            z-index: 1000;
+            width: 100%;
+            max-height: 300px;
+            overflow-y: auto;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.15);
+        }}
+        
+        .search-results .list-group-item {{
+            font-size: 0.875rem;
+            padding: 4px 10px;
+        }}
+        
         .stats {{
             background: #e9ecef;
             padding: 10px;
@@ -581,6 +1132,11 @@ def generate_web_interface(csv_file_path, output_file_name):
     <div class="control-panel">
         <div class="row">
             <div class="col-md-4">
+                <label for="itemSearch" class="form-label">Search Items:</label>
+                <div class="search-box">
+                    <input type="search" class="form-control" id="itemSearch" placeholder="Part of an ID, name, event or type..." autocomplete="off">
+                    <div class="list-group search-results" id="searchResults"></div>
+                </div>
                 <label for="itemSelect" class="form-label">Select Item ID:</label>
                 <select class="form-select" id="itemSelect">
                     <option value="">Choose an item...</option>
@@ -593,6 +1149,15 @@ def generate_web_interface(csv_file_path, output_file_name):
                     <option value="2" selected>2 - Include 2nd level</option>
                     <option value="3">3 - Include 3rd level</option>
                     <option value="4">4 - Include 4th level</option>
+                    <option value="explore">Explore - click nodes to expand</option>
+                </select>
+                <label for="fanoutSelect" class="form-label mt-2">Max Neighbours Shown:</label>
+                <select class="form-select" id="fanoutSelect">
+                    {fanout_options}
+                </select>
+                <label for="rankBySelect" class="form-label mt-2">Keep Neighbours:</label>
+                <select class="form-select" id="rankBySelect">
+                    {rank_options}
                 </select>
             </div>
             <div class="col-md-3">
@@ -610,6 +1175,12 @@ def generate_web_interface(csv_file_path, output_file_name):
             <span id="nodeCount">0</span> nodes, 
             <span id="edgeCount">0</span> edges
         </div>
+        
+        <div class="stats" id="timingPanel" style="display: none;">
+            <strong>Timings:</strong>
+            <span id="timingSummary"></span>
+            <button class="btn btn-sm btn-outline-secondary ms-2" onclick="exportTimings()">Export JSON</button>
+        </div>
     </div>
 
     <div class="loading" id="loadingIndicator">
@@ -623,18 +1194,129 @@ def generate_web_interface(csv_file_path, output_file_name):
         <div id="container" class="card-body"></div>
     </div>
 
+    {EXPLORER_DATA_PLACEHOLDER}
     <script type="text/javascript">
-        // Data from Python
-        const allItems = {all_items_json};
-        const relationships = {relationships_json};
-        const reverseRelationships = {reverse_relationships_json};
-        const itemOptions = {item_options_json};
+        // Data from Python, filled in from the #explorerData block by loadExplorerData()
+        let allItems = {{}};
+        let relationships = {{}};
+        let reverseRelationships = {{}};
+        let itemOptions = [];
+        let searchIndex = {{}};
         
         let currentChart = null;
         
+        // Hub pruning: a "+N more" node stands in for the neighbours beyond the per-node cap
+        const SUMMARY_NODE_SUFFIX = '{SUMMARY_NODE_SUFFIX}';
+        const SUMMARY_NODE_COLOR = '{SUMMARY_NODE_COLOR}';
+        let fanoutOverrides = new Map();  // node id -> extra neighbours revealed from its "+N more" node
+        let shownSubgraph = null;         // [item id, depth] of the network shown outside explore mode
+        
+        // Performance telemetry: the main steps are measured with performance.mark/measure, so they
+        // also appear in the browser profiler, and kept here for the timing panel and JSON export
+        const TIMING_LIMIT = 500;
+        const TIMING_STEPS = {{
+            'data-parse': 'Data parse',
+            'populate-select': 'Dropdown',
+            'related-items': 'Traversal',
+            'chart-render': 'Chart render',
+            'chart-simulation': 'Layout'
+        }};
+        const timings = [];
+        let datasetInfo = {{}};
+        let pendingSimulation = null;
+        
+        function startTiming(step) {{
+            performance.mark(`${{step}}:start`);
+        }}
+        
+        function endTiming(step, detail = {{}}) {{
+            performance.mark(`${{step}}:end`);
+            performance.measure(step, `${{step}}:start`, `${{step}}:end`);
+            const measures = performance.getEntriesByName(step, 'measure');
+            const measure = measures[measures.length - 1];
+            // The duration is copied into timings, so drop the entries instead of growing the performance buffer
+            performance.clearMarks(`${{step}}:start`);
+            performance.clearMarks(`${{step}}:end`);
+            performance.clearMeasures(step);
+            
+            timings.push({{
+                step: step,
+                duration: Math.round(measure.duration * 100) / 100,
+                startTime: Math.round(measure.startTime * 100) / 100,
+                ...detail
+            }});
+            if (timings.length > TIMING_LIMIT) {{
+                timings.shift();
+            }}
+            updateTimingPanel();
+        }}
+        
+        function formatDuration(ms) {{
+            return ms < 1000 ? `${{ms.toFixed(1)}} ms` : `${{(ms / 1000).toFixed(2)}} s`;
+        }}
+        
+        // Show the latest duration of each step
+        function updateTimingPanel() {{
+            const latest = {{}};
+            timings.forEach(timing => {{ latest[timing.step] = timing; }});
+            const parts = Object.entries(TIMING_STEPS)
+                .filter(([step]) => latest[step])
+                .map(([step, label]) => `${{label}} ${{formatDuration(latest[step].duration)}}`);
+            
+            document.getElementById('timingSummary').textContent = parts.join(' \u00b7 ');
+            document.getElementById('timingPanel').style.display = 'block';
+        }}
+        
+        // Download every recorded timing with the dataset size, for comparison across releases
+        function exportTimings() {{
+            const report = {{
+                exportedAt: new Date().toISOString(),
+                userAgent: navigator.userAgent,
+                dataset: datasetInfo,
+                timings: timings
+            }};
+            const blob = new Blob([JSON.stringify(report, null, 2)], {{ type: 'application/json' }});
+            const link = document.createElement('a');
+            link.href = URL.createObjectURL(blob);
+            link.download = 'mantle_explorer_timings.json';
+            document.body.appendChild(link);
+            link.click();
+            link.remove();
+            setTimeout(() => URL.revokeObjectURL(link.href), 0);
+        }}
+        
+        // Parse the embedded data, decompressing it first if the page was written in packed form
+        async function loadExplorerData() {{
+            const element = document.getElementById('explorerData');
+            startTiming('data-parse');
+            let data;
+            if (element.dataset.encoding === 'gzip') {{
+                const response = await fetch(`data:application/octet-stream;base64,${{element.textContent.trim()}}`);
+                const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+                data = await new Response(stream).json();
+            }} else {{
+                data = JSON.parse(element.textContent);
+            }}
+            
+            allItems = data.allItems;
+            relationships = data.relationships;
+            reverseRelationships = data.reverseRelationships;
+            itemOptions = data.itemOptions;
+            searchIndex = data.searchIndex;
+            
+            datasetInfo = {{
+                items: itemOptions.length,
+                relationships: Object.values(relationships).reduce((total, targets) => total + targets.length, 0),
+                payloadCharacters: element.textContent.length,
+                encoding: element.dataset.encoding || 'json'
+            }};
+            endTiming('data-parse', datasetInfo);
+        }}
+        
         // Populate the item dropdown
         function populateItemSelect() {{
             const select = document.getElementById('itemSelect');
+            startTiming('populate-select');
             
             itemOptions.forEach(item => {{
                 const option = document.createElement('option');
@@ -642,10 +1324,252 @@ def generate_web_interface(csv_file_path, output_file_name):
                 option.textContent = `${{item.id}} - ${{item.name}} (${{item.type}})`;
                 select.appendChild(option);
             }});
+            endTiming('populate-select', {{ options: itemOptions.length }});
+        }}
+        
+        // Fuzzy item search over the trigram index built by Python (see build_search_index)
+        const SEARCH_RESULT_LIMIT = 20;
+        const SEARCH_BITMAP_PREFIX = '{SEARCH_BITMAP_PREFIX}';
+        const searchPostings = new Map();
+        let searchCounts = null;
+        let searchTexts = null;
+        
+        // Must match normalize_search_text() in Python
+        function normalizeSearchText(text) {{
+            return String(text).toLowerCase().replace(/[^a-z0-9]+/g, ' ').trim();
+        }}
+        
+        function decodeBase64(text) {{
+            const binary = atob(text);
+            const bytes = new Uint8Array(binary.length);
+            for (let i = 0; i < binary.length; i++) {{
+                bytes[i] = binary.charCodeAt(i);
+            }}
+            return bytes;
+        }}
+        
+        // Positions in itemOptions of the items containing a trigram, decoded on first use
+        // (see encode_postings: a bitmap, or varint gaps where each byte below 0x80 ends a value)
+        function getPostings(trigram) {{
+            let positions = searchPostings.get(trigram);
+            if (!positions) {{
+                const encoded = searchIndex[trigram] || '';
+                if (encoded.startsWith(SEARCH_BITMAP_PREFIX)) {{
+                    const bitmap = decodeBase64(encoded.slice(SEARCH_BITMAP_PREFIX.length));
+                    let count = 0;
+                    for (let i = 0; i < bitmap.length; i++) {{
+                        for (let byte = bitmap[i]; byte; byte &= byte - 1) count++;
+                    }}
+                    positions = new Int32Array(count);
+                    count = 0;
+                    for (let i = 0; i < bitmap.length; i++) {{
+                        for (let bit = 0, byte = bitmap[i]; byte; bit++, byte >>= 1) {{
+                            if (byte & 1) positions[count++] = i * 8 + bit;
+                        }}
+                    }}
+                }} else {{
+                    const bytes = decodeBase64(encoded);
+                    let count = 0;
+                    for (let i = 0; i < bytes.length; i++) {{
+                        if (bytes[i] < 0x80) count++;
+                    }}
+                    positions = new Int32Array(count);
+                    count = 0;
+                    let position = 0, gap = 0, shift = 0;
+                    for (let i = 0; i < bytes.length; i++) {{
+                        gap |= (bytes[i] & 0x7F) << shift;
+                        if (bytes[i] & 0x80) {{
+                            shift += 7;
+                        }} else {{
+                            position += gap;
+                            positions[count++] = position;
+                            gap = 0;
+                            shift = 0;
+                        }}
+                    }}
+                }}
+                searchPostings.set(trigram, positions);
+            }}
+            return positions;
+        }}
+        
+        // Normalized text of an item, built only for items that become candidates
+        function getSearchText(position) {{
+            if (searchTexts[position] === null) {{
+                const item = itemOptions[position];
+                searchTexts[position] = normalizeSearchText(`${{item.id}} ${{item.name}} ${{item.type}}`);
+            }}
+            return searchTexts[position];
+        }}
+        
+        // Rank items by the share of query trigrams they contain, boosting exact IDs and substring matches
+        function searchItems(query) {{
+            const text = normalizeSearchText(query);
+            if (text.length < 2) return [];
+            
+            // Only the start is padded, so a partly typed last word still matches longer words
+            const padded = ' ' + text;
+            const trigrams = new Set();
+            for (let i = 0; i + 3 <= padded.length; i++) {{
+                trigrams.add(padded.slice(i, i + 3));
+            }}
+            
+            if (!searchCounts) {{
+                searchCounts = new Uint16Array(itemOptions.length);
+                searchTexts = new Array(itemOptions.length).fill(null);
+            }}
+            
+            // An item sharing at least `minimum` trigrams must be in one of the rarest
+            // (size - minimum + 1) posting lists, so only those lists add candidates
+            const minimum = Math.max(1, Math.ceil(trigrams.size / 2));
+            const lists = [...trigrams].map(getPostings).sort((a, b) => a.length - b.length);
+            const candidates = [];
+            lists.forEach((positions, index) => {{
+                if (index <= lists.length - minimum) {{
+                    for (let i = 0; i < positions.length; i++) {{
+                        if (searchCounts[positions[i]]++ === 0) candidates.push(positions[i]);
+                    }}
+                }} else {{
+                    for (let i = 0; i < positions.length; i++) {{
+                        if (searchCounts[positions[i]] > 0) searchCounts[positions[i]]++;
+                    }}
+                }}
+            }});
+            
+            const results = [];
+            candidates.forEach(position => {{
+                const count = searchCounts[position];
+                searchCounts[position] = 0;
+                if (count < minimum) return;
+                
+                const item = itemOptions[position];
+                const searchText = getSearchText(position);
+                let score = count / trigrams.size;
+                // The search text starts with the normalized ID, so only items it starts with need the full check
+                if (searchText.startsWith(text) && normalizeSearchText(item.id) === text) {{
+                    score += 2;
+                }} else if (searchText.includes(text)) {{
+                    score += 1;
+                }}
+                results.push({{ item, score }});
+            }});
+            
+            results.sort((a, b) => b.score - a.score || a.item.name.length - b.item.name.length);
+            return results.slice(0, SEARCH_RESULT_LIMIT).map(result => result.item);
+        }}
+        
+        function showSearchResults() {{
+            const query = document.getElementById('itemSearch').value;
+            const list = document.getElementById('searchResults');
+            const started = performance.now();
+            const matches = searchItems(query);
+            
+            list.innerHTML = '';
+            matches.forEach(item => {{
+                const entry = document.createElement('button');
+                entry.type = 'button';
+                entry.className = 'list-group-item list-group-item-action';
+                entry.textContent = `${{item.id}} - ${{item.name}} (${{item.type}})`;
+                // mousedown fires before the search box loses focus and hides the list
+                entry.addEventListener('mousedown', event => {{
+                    event.preventDefault();
+                    chooseSearchResult(item.id);
+                }});
+                list.appendChild(entry);
+            }});
+            list.style.display = matches.length ? 'block' : 'none';
+            
+            if (query) {{
+                console.log(`Search "${{query}}": ${{matches.length}} results in ${{(performance.now() - started).toFixed(1)}} ms`);
+            }}
+        }}
+        
+        function chooseSearchResult(itemId) {{
+            document.getElementById('itemSelect').value = itemId;
+            document.getElementById('itemSearch').value = '';
+            document.getElementById('searchResults').style.display = 'none';
+        }}
+        
+        function handleSearchKey(event) {{
+            if (event.key === 'Enter') {{
+                const matches = searchItems(event.target.value);
+                if (matches.length) chooseSearchResult(matches[0].id);
+            }} else if (event.key === 'Escape') {{
+                document.getElementById('searchResults').style.display = 'none';
+            }}
+        }}
+        
+        // Build the node info for an item shown at the given depth
+        function createNodeInfo(itemId, depth) {{
+            const nodeInfo = {{ ...allItems[itemId] }};
+            nodeInfo.depth = depth;
+            nodeInfo.marker = {{ radius: Math.max(6, 12 - depth * 2) }};
+            
+            // Highlight the root node
+            if (depth === 0) {{
+                nodeInfo.color = '#FF4444';
+                nodeInfo.marker.radius = 15;
+            }}
+            
+            return nodeInfo;
+        }}
+        
+        // Convert a node for Highcharts
+        function getMaxFanout() {{
+            return parseInt(document.getElementById('fanoutSelect').value) || 0;
+        }}
+        
+        function getRankBy() {{
+            return document.getElementById('rankBySelect').value || 'degree';
+        }}
+        
+        // Order neighbours most relevant first, then by ID, like add_neighbours() in Python
+        function compareRelevance(rankBy) {{
+            const degree = id => (relationships[id] || []).length + (reverseRelationships[id] || []).length;
+            const flagged = id => allItems[id].flagged ? 1 : 0;
+            return (a, b) => (rankBy === 'flagged' ? flagged(b) - flagged(a) : 0) || degree(b) - degree(a)
+                || (a < b ? -1 : a > b ? 1 : 0);
+        }}
+        
+        // Keep the maxFanout most relevant neighbour IDs; the rest go behind a "+N more" node
+        function pruneNeighbours(neighbourIds, maxFanout, rankBy) {{
+            if (!(maxFanout > 0) || neighbourIds.length <= maxFanout) {{
+                return {{ shown: neighbourIds, hidden: [] }};
+            }}
+            const ranked = neighbourIds.slice().sort(compareRelevance(rankBy));
+            return {{ shown: ranked.slice(0, maxFanout), hidden: ranked.slice(maxFanout) }};
+        }}
+        
+        function createSummaryNode(parentId, hiddenCount, depth) {{
+            const label = `+${{hiddenCount}} more`;
+            return {{
+                id: parentId + SUMMARY_NODE_SUFFIX,
+                name: label,
+                node_name: label,
+                type: 'Hidden neighbours',
+                color: SUMMARY_NODE_COLOR,
+                depth: depth,
+                parentId: parentId,
+                marker: {{ radius: 9 }}
+            }};
+        }}
+        
+        function toHighchartsNode(node, hint) {{
+            return {{
+                id: node.id,
+                name: node.node_name || node.name, // Use short name for display
+                fullName: node.name, // Keep full name for tooltip
+                marker: node.marker,
+                color: node.color,
+                dataLabels: {{ enabled: true }},
+                type: node.type,
+                parentId: node.parentId,
+                hint: node.parentId ? 'Click to show more' : hint
+            }};
         }}
         
         // Get related items with BFS
-        function getRelatedItems(itemId, maxDepth) {{
+        function getRelatedItems(itemId, maxDepth, maxFanout = 0, rankBy = 'degree', overrides = null) {{
             if (!allItems[itemId]) {{
                 return {{ nodes: [], edges: [] }};
             }}
@@ -662,49 +1586,179 @@ def generate_web_interface(csv_file_path, output_file_name):
                 
                 // Add current node
                 if (allItems[currentId]) {{
-                    const nodeInfo = {{ ...allItems[currentId] }};
-                    nodeInfo.depth = depth;
-                    nodeInfo.marker = {{ radius: Math.max(6, 12 - depth * 2) }};
-                    
-                    // Highlight the root node
-                    if (depth === 0) {{
-                        nodeInfo.color = '#FF4444';
-                        nodeInfo.marker.radius = 15;
-                    }}
-                    
-                    nodes.push(nodeInfo);
+                    nodes.push(createNodeInfo(currentId, depth));
                 }}
                 
                 if (depth < maxDepth) {{
-                    // Add dependencies (items this depends on)
-                    const deps = reverseRelationships[currentId] || [];
-                    deps.forEach(depId => {{
-                        if (!visited.has(depId) && allItems[depId]) {{
-                            visited.add(depId);
-                            queue.push([depId, depth + 1]);
-                            edges.push([depId, currentId]);
+                    // New dependencies (items this depends on), then new dependents (items that depend on this)
+                    const newNeighbours = new Map();
+                    (reverseRelationships[currentId] || []).forEach(depId => {{
+                        if (!visited.has(depId) && allItems[depId] && !newNeighbours.has(depId)) {{
+                            newNeighbours.set(depId, [depId, currentId]);
                         }}
                     }});
-                    
-                    // Add dependents (items that depend on this)
-                    const dependents = relationships[currentId] || [];
-                    dependents.forEach(dependentId => {{
-                        if (!visited.has(dependentId) && allItems[dependentId]) {{
-                            visited.add(dependentId);
-                            queue.push([dependentId, depth + 1]);
-                            edges.push([currentId, dependentId]);
+                    (relationships[currentId] || []).forEach(dependentId => {{
+                        if (!visited.has(dependentId) && allItems[dependentId] && !newNeighbours.has(dependentId)) {{
+                            newNeighbours.set(dependentId, [currentId, dependentId]);
                         }}
                     }});
+                    
+                    // Each click on a node's "+N more" node raises its cap by another maxFanout
+                    const cap = maxFanout && maxFanout + ((overrides && overrides.get(currentId)) || 0);
+                    const {{ shown, hidden }} = pruneNeighbours([...newNeighbours.keys()], cap, rankBy);
+                    shown.forEach(neighbourId => {{
+                        visited.add(neighbourId);
+                        queue.push([neighbourId, depth + 1]);
+                        edges.push(newNeighbours.get(neighbourId));
+                    }});
+                    if (hidden.length > 0) {{
+                        const summary = createSummaryNode(currentId, hidden.length, depth + 1);
+                        nodes.push(summary);
+                        edges.push([currentId, summary.id]);
+                    }}
                 }}
             }}
             
             return {{ nodes, edges }};
         }}
         
+        // Cache of recently computed subgraphs, keyed by "itemId|depth|maxFanout|rankBy" (Map keeps insertion order for LRU)
+        const SUBGRAPH_CACHE_SIZE = 50;
+        const subgraphCache = new Map();
+        
+        // Related items as chart nodes, with the current hub pruning settings
+        function buildSubgraph(itemId, maxDepth, overrides) {{
+            const maxFanout = getMaxFanout();
+            startTiming('related-items');
+            const {{ nodes, edges }} = getRelatedItems(itemId, maxDepth, maxFanout, getRankBy(), overrides);
+            endTiming('related-items', {{ itemId: itemId, depth: maxDepth, maxFanout: maxFanout, nodes: nodes.length, edges: edges.length }});
+            return {{ nodes: nodes.map(node => toHighchartsNode(node, 'Click for more options')), edges }};
+        }}
+        
+        function getCachedSubgraph(itemId, maxDepth) {{
+            const key = `${{itemId}}|${{maxDepth}}|${{getMaxFanout()}}|${{getRankBy()}}`;
+            let subgraph = subgraphCache.get(key);
+            if (subgraph) {{
+                // Move to the most recently used position
+                subgraphCache.delete(key);
+            }} else {{
+                subgraph = buildSubgraph(itemId, maxDepth, null);
+                if (subgraphCache.size >= SUBGRAPH_CACHE_SIZE) {{
+                    subgraphCache.delete(subgraphCache.keys().next().value);
+                }}
+            }}
+            subgraphCache.set(key, subgraph);
+            return subgraph;
+        }}
+        
+        // Incremental exploration state, only set while the depth is "explore":
+        // nodes/edges currently shown, which node opened each node, and which nodes are expanded
+        let exploration = null;
+        
+        function startExploration(itemId) {{
+            exploration = {{
+                nodes: new Map(),     // node id -> node info
+                edges: new Map(),     // "from|to" -> {{ edge, owner }}
+                children: new Map(),  // node id -> Set of node ids it opened
+                expanded: new Set()
+            }};
+            exploration.nodes.set(itemId, createNodeInfo(itemId, 0));
+            expandNode(itemId);
+        }}
+        
+        // Append the unseen neighbours of a node, one level deeper than the node itself
+        function expandNode(nodeId) {{
+            const node = exploration.nodes.get(nodeId);
+            const opened = exploration.children.get(nodeId) || new Set();
+            const neighbours = [
+                ...(reverseRelationships[nodeId] || []).map(depId => [depId, [depId, nodeId]]),
+                ...(relationships[nodeId] || []).map(dependentId => [dependentId, [nodeId, dependentId]])
+            ];
+            
+            // Drop an earlier "+N more" node; it is added again below while neighbours remain hidden
+            const summaryId = nodeId + SUMMARY_NODE_SUFFIX;
+            if (opened.delete(summaryId)) {{
+                exploration.nodes.delete(summaryId);
+                exploration.edges.delete(`${{nodeId}}|${{summaryId}}`);
+            }}
+            
+            const unseenIds = [...new Set(neighbours.map(([neighbourId]) => neighbourId))]
+                .filter(neighbourId => allItems[neighbourId] && !exploration.nodes.has(neighbourId));
+            const hidden = new Set(pruneNeighbours(unseenIds, getMaxFanout(), getRankBy()).hidden);
+            
+            neighbours.forEach(([neighbourId, edge]) => {{
+                if (!allItems[neighbourId] || hidden.has(neighbourId)) {{
+                    return;
+                }}
+                if (!exploration.nodes.has(neighbourId)) {{
+                    exploration.nodes.set(neighbourId, createNodeInfo(neighbourId, node.depth + 1));
+                    opened.add(neighbourId);
+                }}
+                const key = edge.join('|');
+                if (!exploration.edges.has(key)) {{
+                    exploration.edges.set(key, {{ edge, owner: nodeId }});
+                }}
+            }});
+            
+            if (hidden.size > 0) {{
+                exploration.nodes.set(summaryId, createSummaryNode(nodeId, hidden.size, node.depth + 1));
+                exploration.edges.set(`${{nodeId}}|${{summaryId}}`, {{ edge: [nodeId, summaryId], owner: nodeId }});
+                opened.add(summaryId);
+            }}
+            
+            exploration.children.set(nodeId, opened);
+            exploration.expanded.add(nodeId);
+        }}
+        
+        // Remove everything opened from a node, including whatever was opened further down
+        function collapseNode(nodeId) {{
+            const removed = new Set();
+            const stack = [...(exploration.children.get(nodeId) || [])];
+            while (stack.length > 0) {{
+                const childId = stack.pop();
+                removed.add(childId);
+                stack.push(...(exploration.children.get(childId) || []));
+                exploration.children.delete(childId);
+                exploration.expanded.delete(childId);
+                exploration.nodes.delete(childId);
+            }}
+            
+            exploration.edges.forEach((entry, key) => {{
+                if (entry.owner === nodeId || removed.has(entry.edge[0]) || removed.has(entry.edge[1])) {{
+                    exploration.edges.delete(key);
+                }}
+            }});
+            exploration.children.delete(nodeId);
+            exploration.expanded.delete(nodeId);
+        }}
+        
+        function toggleExploredNode(nodeId) {{
+            if (exploration.expanded.has(nodeId)) {{
+                collapseNode(nodeId);
+            }} else {{
+                expandNode(nodeId);
+            }}
+            renderExploration();
+        }}
+        
+        function renderExploration() {{
+            const nodes = Array.from(exploration.nodes.values(), node =>
+                toHighchartsNode(node, exploration.expanded.has(node.id) ? 'Click to collapse' : 'Click to expand')
+            );
+            const edges = Array.from(exploration.edges.values(), entry => entry.edge.slice());
+            
+            document.getElementById('nodeCount').textContent = nodes.length;
+            document.getElementById('edgeCount').textContent = edges.length;
+            document.getElementById('networkStats').style.display = 'block';
+            
+            updateChart(edges, nodes);
+        }}
+        
         // Generate network diagram
         function generateNetwork() {{
             const itemId = document.getElementById('itemSelect').value;
-            const depth = parseInt(document.getElementById('depthSelect').value);
+            const depthValue = document.getElementById('depthSelect').value;
+            const depth = parseInt(depthValue);
             
             if (!itemId) {{
                 alert('Please select an item ID');
@@ -718,29 +1772,15 @@ def generate_web_interface(csv_file_path, output_file_name):
             // Small delay to allow UI to update
             setTimeout(() => {{
                 try {{
-                    const {{ nodes, edges }} = getRelatedItems(itemId, depth);
-                    
-                    console.log("Nodes:", nodes.length, nodes);
-                    console.log("Edges:", edges.length, edges);
-                    
-                    // Update statistics
-                    document.getElementById('nodeCount').textContent = nodes.length;
-                    document.getElementById('edgeCount').textContent = edges.length;
-                    document.getElementById('networkStats').style.display = 'block';
-                    
-                    // Convert nodes for Highcharts
-                    const highchartsNodes = nodes.map(node => ({{
-                        id: node.id,
-                        name: node.node_name || node.name, // Use short name for display
-                        fullName: node.name, // Keep full name for tooltip
-                        marker: node.marker,
-                        color: node.color,
-                        dataLabels: {{ enabled: true }},
-                        type: node.type
-                    }}));
-                    
-                    // Create/update chart
-                    createChart(edges, highchartsNodes);
+                    if (depthValue === 'explore') {{
+                        startExploration(itemId);
+                        renderExploration();
+                        return;
+                    }}
+                    exploration = null;
+                    fanoutOverrides = new Map();
+                    shownSubgraph = [itemId, depth];
+                    showSubgraph();
                     
                 }} catch (error) {{
                     console.error('Error generating network:', error);
@@ -753,20 +1793,58 @@ def generate_web_interface(csv_file_path, output_file_name):
             }}, 100);
         }}
         
-        // Create Highcharts network
-        function createChart(edges, nodes) {{
-            // Add nodes through event
-            Highcharts.addEvent(Highcharts.Series, 'afterSetOptions', function (e) {{
-                if (this instanceof Highcharts.Series.types.networkgraph && e.options.id === 'network') {{
-                    e.options.nodes = nodes;
-                }}
-            }});
+        // Draw the shownSubgraph network, including neighbours revealed from "+N more" nodes
+        function showSubgraph() {{
+            const [itemId, depth] = shownSubgraph;
+            const {{ nodes, edges }} = fanoutOverrides.size === 0
+                ? getCachedSubgraph(itemId, depth)
+                : buildSubgraph(itemId, depth, fanoutOverrides);
+            
+            console.log("Nodes:", nodes.length, nodes);
+            console.log("Edges:", edges.length, edges);
             
-            // Destroy existing chart
+            // Update statistics
+            document.getElementById('nodeCount').textContent = nodes.length;
+            document.getElementById('edgeCount').textContent = edges.length;
+            document.getElementById('networkStats').style.display = 'block';
+            
+            // Highcharts keeps references to the options it is given, so hand it copies
+            // and leave the cached subgraph untouched
+            updateChart(
+                edges.map(edge => edge.slice()),
+                nodes.map(node => ({{ ...node, marker: {{ ...node.marker }} }}))
+            );
+        }}
+        
+        // Reveal the next batch of neighbours behind a "+N more" node
+        function showMoreNeighbours(parentId) {{
+            if (exploration) {{
+                expandNode(parentId);
+                renderExploration();
+            }} else {{
+                fanoutOverrides.set(parentId, (fanoutOverrides.get(parentId) || 0) + getMaxFanout());
+                showSubgraph();
+            }}
+        }}
+        
+        // Show the given network, creating the chart on first use and updating its series afterwards
+        function updateChart(edges, nodes) {{
+            const detail = {{ nodes: nodes.length, edges: edges.length }};
+            startTiming('chart-render');
             if (currentChart) {{
-                currentChart.destroy();
+                currentChart.series[0].update({{ nodes: nodes, data: edges }}, true);
+            }} else {{
+                createChart(edges, nodes);
             }}
-            
+            endTiming('chart-render', detail);
+            // The layout simulation keeps running after the render returns; afterSimulation ends its timing,
+            // so starting it here keeps the render out of the layout time
+            pendingSimulation = detail;
+            startTiming('chart-simulation');
+        }}
+        
+        // Create Highcharts network
+        function createChart(edges, nodes) {{
             currentChart = Highcharts.chart('container', {{
                 chart: {{
                     type: 'networkgraph',
@@ -780,6 +1858,14 @@ def generate_web_interface(csv_file_path, output_file_name):
                 plotOptions: {{
                     networkgraph: {{
                         keys: ['from', 'to'],
+                        events: {{
+                            afterSimulation: function() {{
+                                if (pendingSimulation) {{
+                                    endTiming('chart-simulation', pendingSimulation);
+                                    pendingSimulation = null;
+                                }}
+                            }}
+                        }},
                         layoutAlgorithm: {{
                             enableSimulation: true,
                             friction: -0.9,
@@ -799,6 +1885,18 @@ def generate_web_interface(csv_file_path, output_file_name):
                         point: {{
                             events: {{
                                 click: function() {{
+                                    // "+N more" nodes reveal the neighbours they stand in for
+                                    if (this.options.parentId) {{
+                                        showMoreNeighbours(this.options.parentId);
+                                        return;
+                                    }}
+                                    
+                                    // In explore mode a click opens or closes the node's neighbours
+                                    if (exploration) {{
+                                        toggleExploredNode(this.id);
+                                        return;
+                                    }}
+                                    
                                     const nodeId = this.id;
                                     const nodeName = this.options.fullName || this.name;
                                     const nodeType = this.options.type;
@@ -838,6 +1936,7 @@ def generate_web_interface(csv_file_path, output_file_name):
                 series: [{{
                     id: 'network',
                     data: edges,
+                    nodes: nodes,
                     marker: {{
                         lineWidth: 2,
                         lineColor: '#ffffff'
@@ -847,7 +1946,7 @@ def generate_web_interface(csv_file_path, output_file_name):
                 legend: {{ enabled: false }},
                 tooltip: {{
                     headerFormat: '<b>{{point.key}}</b><br>',
-                    pointFormat: '<b>Full Name:</b> {{point.fullName}}<br><b>Type:</b> {{point.type}}<br><b>Connections:</b> {{point.linksTo.length}}<br><i>Click for more options</i>',
+                    pointFormat: '<b>Full Name:</b> {{point.fullName}}<br><b>Type:</b> {{point.type}}<br><b>Connections:</b> {{point.linksTo.length}}<br><i>{{point.hint}}</i>',
                     backgroundColor: 'rgba(0,0,0,0.8)',
                     style: {{ color: '#ffffff' }}
                 }}
@@ -856,10 +1955,13 @@ def generate_web_interface(csv_file_path, output_file_name):
         
         // Clear network
         function clearNetwork() {{
+            // Keep the chart instance around for the next network, just empty it
             if (currentChart) {{
-                currentChart.destroy();
-                currentChart = null;
+                currentChart.series[0].update({{ nodes: [], data: [] }}, true);
             }}
+            exploration = null;
+            shownSubgraph = null;
+            fanoutOverrides = new Map();
             document.getElementById('networkStats').style.display = 'none';
             document.getElementById('itemSelect').value = '';
         }}
@@ -879,40 +1981,676 @@ def generate_web_interface(csv_file_path, output_file_name):
         }}
         
         // Initialize
-        document.addEventListener('DOMContentLoaded', function() {{
+        document.addEventListener('DOMContentLoaded', async function() {{
+            await loadExplorerData();
             populateItemSelect();
+            
+            const search = document.getElementById('itemSearch');
+            search.addEventListener('input', showSearchResults);
+            search.addEventListener('focus', showSearchResults);
+            search.addEventListener('keydown', handleSearchKey);
+            search.addEventListener('blur', () => {{
+                document.getElementById('searchResults').style.display = 'none';
+            }});
         }});
     </script>
 </body>
 </html>"""
 
-    # Write the HTML file
+    # Stream the page around the data block so the payload is never held as one string
+    html_head, html_tail = html_template.split(EXPLORER_DATA_PLACEHOLDER)
     with open(output_file_name, 'w', encoding='utf-8') as f:
-        f.write(html_template)
+        f.write(html_head)
+        f.write('<script type="application/json" id="explorerData">')
+        for chunk in iter_payload_chunks(relationships, reverse_relationships, all_items, item_options, search_index):
+            # '<' only occurs inside JSON strings; escaping every one keeps "</script>" and "<!--<script>"
+            # in item names from closing the data block early or switching the parser into script-data states
+            f.write(chunk.replace('<', '\\u003c'))
+        f.write('</script>')
+        f.write(html_tail)
+    
+    if verbose:
+        print(f"Successfully generated interactive web interface: '{output_file_name}'")
+    
+    if 'gz' in compress:
+        write_compressed_copy(output_file_name, 'gz', verbose)
+    if 'br' in compress:
+        write_compressed_copy(output_file_name, 'br', verbose)
+    if 'packed' in compress:
+        write_self_decompressing_page(
+            html_head, html_tail,
+            iter_payload_chunks(relationships, reverse_relationships, all_items, item_options, search_index),
+            output_file_name, verbose
+        )
+
+    if verbose:
+        print(f"Features:")
+        print(f"- Select from {len(item_options)} available items")
+        print(f"- Adjustable relationship depth (1-4 levels)")
+        print(f"- Real-time network generation")
+        print(f"- Network statistics display")
+
+# --- Sharded Output ---
+def partition_graph(relationships, reverse_relationships, all_items, attribute):
+    """Splits the graph into one subgraph per value of `attribute`.
+    
+    Each subgraph holds the items with that value plus, as grey boundary nodes, their
+    direct neighbours from other partitions. Returns {value: (relationships, reverse_relationships, all_items)}.
+    """
+    members = defaultdict(list)
+    for item_id, item_info in all_items.items():
+        members[item_info.get(attribute) or SHARD_EMPTY_VALUE].append(item_id)
     
-    print(f"Successfully generated interactive web interface: '{output_file_name}'")
-    print(f"Features:")
-    print(f"- Select from {len(item_options)} available items")
-    print(f"- Adjustable relationship depth (1-4 levels)")
-    print(f"- Real-time network generation")
-    print(f"- Network statistics display")
+    partitions = {}
+    for value in sorted(members):
+        core_ids = members[value]
+        core = set(core_ids)
+        
+        # Every edge touching a core item, in both directions
+        part_relationships = defaultdict(set)
+        part_reverse_relationships = defaultdict(set)
+        for item_id in core_ids:
+            for dependent_id in relationships.get(item_id, ()):
+                if dependent_id in all_items:
+                    part_relationships[item_id].add(dependent_id)
+                    part_reverse_relationships[dependent_id].add(item_id)
+            for dep_id in reverse_relationships.get(item_id, ()):
+                if dep_id in all_items:
+                    part_relationships[dep_id].add(item_id)
+                    part_reverse_relationships[item_id].add(dep_id)
+        
+        part_items = {item_id: all_items[item_id] for item_id in core_ids}
+        boundary_ids = (part_relationships.keys() | part_reverse_relationships.keys()) - core
+        for item_id in sorted(boundary_ids):
+            item_info = all_items[item_id]
+            part_items[item_id] = {
+                **item_info,
+                'name': f"[{item_info.get(attribute) or SHARD_EMPTY_VALUE}] {item_info['name']}",
+                'color': BOUNDARY_NODE_COLOR
+            }
+        
+        partitions[value] = (dict(part_relationships), dict(part_reverse_relationships), part_items)
+    return partitions
+
+def get_shard_file_name(attribute, value, used_names):
+    """Returns a unique, filesystem-safe page name for a partition value."""
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', value).strip('_').lower() or 'none'
+    file_name = f"{attribute}_{slug}.html"
+    counter = 2
+    while file_name in used_names:
+        file_name = f"{attribute}_{slug}_{counter}.html"
+        counter += 1
+    used_names.add(file_name)
+    return file_name
+
+def write_shard_page(subgraph, page_file, compress=(), max_fanout=DEFAULT_MAX_FANOUT, rank_by='degree'):
+    """Worker task: writes one partition's explorer page and returns its (items, relationships) counts."""
+    relationships, reverse_relationships, all_items = subgraph
+    write_web_interface(
+        relationships, reverse_relationships, all_items, page_file, compress, verbose=False, max_fanout=max_fanout,
+        rank_by=rank_by
+    )
+    return len(all_items), sum(len(v) for v in relationships.values())
+
+def write_shard_index(index_file, attribute, shards):
+    """Writes the index page linking to every partition page."""
+    rows = "\n".join(
+        f"""                <tr>
+                    <td><a href="{html.escape(shard['file'])}">{html.escape(shard['value'])}</a></td>
+                    <td class="text-end">{shard['core']}</td>
+                    <td class="text-end">{shard['items'] - shard['core']}</td>
+                    <td class="text-end">{shard['relationships']}</td>
+                </tr>"""
+        for shard in shards
+    )
+    index_html = f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Mantle Network Explorer - by {attribute}</title>
+    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.0.0-beta3/dist/css/bootstrap.min.css" rel="stylesheet">
+    <style type="text/css">
+        body {{
+            background-color: #f8f9fa;
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+        }}
+        
+        .control-panel {{
+            background: white;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            padding: 20px;
+            margin: 20px;
+        }}
+        
+        h1 {{
+            color: #333;
+            margin: 20px 0;
+            font-weight: 300;
+        }}
+    </style>
+</head>
+
+<body>
+    <center>
+        <h1>Mantle Network Explorer - by {attribute}</h1>
+    </center>
+
+    <div class="control-panel">
+        <table class="table table-hover">
+            <thead>
+                <tr>
+                    <th>{attribute}</th>
+                    <th class="text-end">Items</th>
+                    <th class="text-end">Boundary items</th>
+                    <th class="text-end">Relationships</th>
+                </tr>
+            </thead>
+            <tbody>
+{rows}
+            </tbody>
+        </table>
+    </div>
+</body>
+</html>"""
+    with open(index_file, 'w', encoding='utf-8') as f:
+        f.write(index_html)
+
+def write_sharded_interface(relationships, reverse_relationships, all_items, output_file_name, attribute,
+                            compress=(), jobs=None, max_fanout=DEFAULT_MAX_FANOUT, rank_by='degree'):
+    """Writes one explorer page per value of `attribute` plus an index page, generating pages in a process pool.
+    
+    Pages go into a directory named after the output file, e.g. mantle_network_explorer_by_display_group/.
+    The pages are written to a temporary directory that then replaces it, so pages of values that
+    no longer exist do not linger from an earlier run.
+    """
+    root, _ = os.path.splitext(output_file_name)
+    shard_dir = f"{root}_by_{attribute}"
+    temp_dir = f"{shard_dir}.tmp"
+    if os.path.exists(temp_dir):
+        shutil.rmtree(temp_dir)
+    os.makedirs(temp_dir)
+    
+    partitions = partition_graph(relationships, reverse_relationships, all_items, attribute)
+    print(f"Writing {len(partitions)} pages by {attribute} to '{shard_dir}'")
+    if 'br' in compress and brotli is None:
+        # Workers write their pages quietly, so warn once here
+        warn_missing_brotli(os.path.join(shard_dir, '*.html.br'))
+    
+    used_names = {'index.html'}
+    shards = [
+        {'value': value, 'file': get_shard_file_name(attribute, value, used_names),
+         'core': sum(1 for item in subgraph[2].values() if (item.get(attribute) or SHARD_EMPTY_VALUE) == value)}
+        for value, subgraph in partitions.items()
+    ]
+    
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(
+                    write_shard_page, subgraph, os.path.join(temp_dir, shard['file']), compress, max_fanout, rank_by
+                )
+                for shard, subgraph in zip(shards, partitions.values())
+            ]
+            for shard, future in zip(shards, futures):
+                shard['items'], shard['relationships'] = future.result()
+                print(f"- {shard['file']}: {shard['core']} items, {shard['items'] - shard['core']} boundary items")
+        
+        write_shard_index(os.path.join(temp_dir, 'index.html'), attribute, shards)
+        
+        # A directory can't be replaced while it has files, so move the old pages aside first
+        old_dir = f"{shard_dir}.old"
+        if os.path.exists(old_dir):
+            shutil.rmtree(old_dir)
+        if os.path.exists(shard_dir):
+            os.replace(shard_dir, old_dir)
+        os.replace(temp_dir, shard_dir)
+        if os.path.exists(old_dir):
+            shutil.rmtree(old_dir)
+    except BaseException:
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+        raise
+    
+    index_file = os.path.join(shard_dir, 'index.html')
+    print(f"Successfully generated sharded web interface: '{index_file}'")
+
+def write_explorer_output(graph, output_file_name, compress=(), shard_by=None, jobs=None,
+                          max_fanout=DEFAULT_MAX_FANOUT, rank_by='degree'):
+    """Writes the explorer as a single page, or as one page per `shard_by` value plus an index."""
+    if shard_by:
+        write_sharded_interface(*graph, output_file_name, shard_by, compress, jobs, max_fanout, rank_by)
+    else:
+        write_web_interface(*graph, output_file_name, compress, max_fanout=max_fanout, rank_by=rank_by)
+
+# --- Watch Mode ---
+def get_file_signature(file_path):
+    """Returns a cheap (mtime, size) signature for a file, or None if it does not exist."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def get_file_digest(file_path):
+    """Returns a SHA-256 digest of the file contents."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def wait_for_stable_signature(file_path, signature, debounce):
+    """Waits until the file has stopped changing for `debounce` seconds and returns its signature."""
+    while True:
+        time.sleep(debounce)
+        settled = get_file_signature(file_path)
+        if settled == signature:
+            return settled
+        signature = settled
+
+def watch_and_regenerate(csv_file_path, output_file_name, poll_interval=1.0, debounce=0.5, compress=(), sqlite_file=None,
+                         use_cache=False, shard_by=None, jobs=None, max_fanout=DEFAULT_MAX_FANOUT, rank_by='degree'):
+    """Regenerates the web interface whenever the input CSV changes, until interrupted.
+    
+    Errors while reading or rebuilding (a half-written or locked file) are reported and the
+    previous output is kept. With use_cache (--cache) the columnar cache is kept up to date, so
+    restarting the watcher on an unchanged CSV skips parsing.
+    """
+    last_signature = get_file_signature(csv_file_path)
+    last_digest = None
+    graph = None
+    announced = False
+    
+    def regenerate(digest):
+        """Rebuilds the graph and rewrites the outputs when the relationships changed."""
+        nonlocal graph
+        started = time.perf_counter()
+        new_graph = build_network_data(csv_file_path, use_cache, digest)
+        if new_graph is None:
+            print("Keeping the previous output until the CSV can be read again")
+            return
+        if new_graph == graph:
+            print(f"No relationship changes detected ({time.perf_counter() - started:.2f}s), output left as is")
+            return
+        
+        if sqlite_file:
+            save_graph_to_sqlite(sqlite_file, *new_graph)
+        write_explorer_output(new_graph, output_file_name, compress, shard_by, jobs, max_fanout, rank_by)
+        graph = new_graph
+        print(f"Regenerated '{output_file_name}' in {time.perf_counter() - started:.2f}s")
+    
+    try:
+        while True:
+            if last_signature is not None:
+                try:
+                    digest = get_file_digest(csv_file_path)
+                    if digest == last_digest:
+                        print("File touched but contents are unchanged, skipping regeneration")
+                    else:
+                        regenerate(digest)
+                        last_digest = digest
+                except OSError as e:
+                    # e.g. the file is locked by the program saving it; try again on the next poll
+                    print(f"Error: Could not read '{csv_file_path}' ({e}), retrying...")
+                    last_signature = None
+                except Exception as e:
+                    print(f"Error: Could not rebuild the network from '{csv_file_path}' ({type(e).__name__}: {e})")
+                    print("Keeping the previous output until the CSV is saved again")
+            else:
+                print(f"Warning: '{csv_file_path}' is missing or unreadable, waiting for it to change...")
+            
+            if not announced:
+                print(f"\nWatching '{csv_file_path}' for changes (polling every {poll_interval}s). Press Ctrl+C to stop.")
+                announced = True
+            
+            # Wait for the next change, then debounce bursts of writes (e.g. spreadsheet saves) before re-reading
+            while True:
+                time.sleep(poll_interval)
+                signature = get_file_signature(csv_file_path)
+                if signature != last_signature:
+                    break
+            last_signature = wait_for_stable_signature(csv_file_path, signature, debounce)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+def query_related_items(input_file, item_id, max_depth, use_cache=False, max_fanout=None, rank_by='degree'):
+    """Prints the items related to item_id, straight from the database when the input is an SQLite store."""
+    if is_sqlite_file(input_file):
+        conn = connect_sqlite_readonly(input_file)
+        try:
+            nodes, edges = get_related_items_sqlite(conn, item_id, max_depth, max_fanout, rank_by)
+        finally:
+            conn.close()
+    else:
+        graph = build_network_data(input_file, use_cache)
+        if graph is None:
+            return
+        relationships, reverse_relationships, all_items = graph
+        nodes, edges = get_related_items(
+            item_id, relationships, reverse_relationships, all_items, max_depth, max_fanout, rank_by
+        )
+    
+    print_related_items(item_id, nodes, edges, max_depth)
+
+# --- Graph Diff ---
+def get_edge_set(relationships):
+    """Returns the relationships as a set of (dependency, dependent) pairs."""
+    return {(dep_id, item_id) for dep_id, dependents in relationships.items() for item_id in dependents}
+
+def get_diff_values(item_info):
+    """Returns the DIFF_ITEM_FIELDS values of an item; a missing flag counts as not flagged."""
+    return tuple(
+        bool(item_info.get(field)) if field == 'flagged' else item_info.get(field)
+        for field in DIFF_ITEM_FIELDS
+    )
+
+def diff_graphs(old_graph, new_graph):
+    """Compares two (relationships, reverse_relationships, all_items) graphs with set operations.
+    
+    Pass the unfiltered graphs, so changes among items unrelated to flagged items are reported too.
+    """
+    old_relationships, _, old_items = old_graph
+    new_relationships, _, new_items = new_graph
+    old_edges = get_edge_set(old_relationships)
+    new_edges = get_edge_set(new_relationships)
+    
+    common_items = old_items.keys() & new_items.keys()
+    return {
+        'added_items': sorted(new_items.keys() - old_items.keys()),
+        'removed_items': sorted(old_items.keys() - new_items.keys()),
+        'modified_items': sorted(
+            item_id for item_id in common_items
+            if get_diff_values(old_items[item_id]) != get_diff_values(new_items[item_id])
+        ),
+        'added_edges': sorted(new_edges - old_edges),
+        'removed_edges': sorted(old_edges - new_edges)
+    }
+
+def build_diff_graph(old_graph, new_graph, diff, context_items=None):
+    """Builds the graph shown in the diff page: changed items and their direct neighbours, colored by status.
+    
+    Relationships are the union of both versions so removed dependencies stay visible. Unchanged
+    neighbours are only shown when they are in context_items (all of them when it is None).
+    """
+    old_relationships, old_reverse_relationships, old_items = old_graph
+    new_relationships, new_reverse_relationships, new_items = new_graph
+    
+    status = {}
+    for item_id in diff['added_items']:
+        status[item_id] = 'added'
+    for item_id in diff['removed_items']:
+        status[item_id] = 'removed'
+    for item_id in diff['modified_items']:
+        status[item_id] = 'modified'
+    for edge in diff['added_edges'] + diff['removed_edges']:
+        for item_id in edge:
+            status.setdefault(item_id, 'rewired')
+    
+    relationships = defaultdict(set)
+    reverse_relationships = defaultdict(set)
+    for graph_relationships, graph_reverse_relationships in ((old_relationships, old_reverse_relationships),
+                                                             (new_relationships, new_reverse_relationships)):
+        for item_id in status:
+            relationships[item_id].update(graph_relationships.get(item_id, ()))
+            reverse_relationships[item_id].update(graph_reverse_relationships.get(item_id, ()))
+    
+    # Keep the changed items plus their neighbours for context
+    shown = set(status)
+    for item_id in status:
+        for neighbour_id in relationships[item_id] | reverse_relationships[item_id]:
+            if context_items is None or neighbour_id in context_items or neighbour_id in status:
+                shown.add(neighbour_id)
+    
+    all_items = {}
+    for item_id in sorted(shown):
+        item_info = new_items.get(item_id) or old_items.get(item_id)
+        if item_info is None:
+            continue
+        item_status = status.get(item_id, 'context')
+        all_items[item_id] = {
+            **item_info,
+            'name': item_info['name'] if item_status == 'context' else f"[{item_status}] {item_info['name']}",
+            'color': DIFF_STATUS_COLORS[item_status]
+        }
+    
+    # Relationships between shown items only
+    relationships = {k: v & all_items.keys() for k, v in relationships.items() if k in all_items}
+    reverse_relationships = {k: v & all_items.keys() for k, v in reverse_relationships.items() if k in all_items}
+    return (
+        {k: v for k, v in relationships.items() if v},
+        {k: v for k, v in reverse_relationships.items() if v},
+        all_items
+    )
+
+def print_diff_report(diff, old_graph, new_graph, limit=DIFF_REPORT_LIMIT):
+    """Prints a summary of the changes between two graphs, listing up to `limit` entries per section."""
+    old_items, new_items = old_graph[2], new_graph[2]
+    old_edge_count = sum(len(v) for v in old_graph[0].values())
+    new_edge_count = sum(len(v) for v in new_graph[0].values())
+    
+    print("\nDifferences:")
+    print(f"  Items:         +{len(diff['added_items'])} added, -{len(diff['removed_items'])} removed, "
+          f"~{len(diff['modified_items'])} modified ({len(old_items)} -> {len(new_items)})")
+    print(f"  Relationships: +{len(diff['added_edges'])} added, -{len(diff['removed_edges'])} removed "
+          f"({old_edge_count} -> {new_edge_count})")
+    
+    sections = [
+        ("Added items", [f"+ {new_items[item_id]['name']}" for item_id in diff['added_items']]),
+        ("Removed items", [f"- {old_items[item_id]['name']}" for item_id in diff['removed_items']]),
+        ("Modified items", [
+            f"~ {item_id}: " + ", ".join(
+                f"{field} {old_value!r} -> {new_value!r}"
+                for field, old_value, new_value in zip(
+                    DIFF_ITEM_FIELDS, get_diff_values(old_items[item_id]), get_diff_values(new_items[item_id])
+                )
+                if old_value != new_value
+            )
+            for item_id in diff['modified_items']
+        ]),
+        ("Added relationships (dependency -> dependent)", [f"+ {dep_id} -> {item_id}" for dep_id, item_id in diff['added_edges']]),
+        ("Removed relationships (dependency -> dependent)", [f"- {dep_id} -> {item_id}" for dep_id, item_id in diff['removed_edges']])
+    ]
+    for title, lines in sections:
+        if not lines:
+            continue
+        print(f"\n{title}:")
+        for line in lines[:limit]:
+            print(f"  {line}")
+        if len(lines) > limit:
+            print(f"  ... and {len(lines) - limit} more")
+
+def load_diff_graphs(input_file, use_cache=False):
+    """Returns the (unfiltered, filtered) graphs of an export for diffing.
+    
+    CSV exports are diffed on their full item and edge tables; the filtered graph only limits
+    the context shown in the HTML view. An SQLite store only holds the filtered graph.
+    """
+    if is_sqlite_file(input_file):
+        print(f"Note: '{input_file}' is an SQLite store and only holds items connected to flagged items")
+        graph = load_graph_from_sqlite(input_file)
+        return graph, graph
+    
+    tables = load_graph_tables(input_file, use_cache)
+    if tables is None:
+        return None
+    
+    items, edges = tables
+    graph = graph_from_tables(items, edges)
+    flagged_items = get_flagged_ids(items)
+    return graph, filter_connected_items(*graph, flagged_items)
+
+def run_diff(old_file, new_file, output_file_name=None, report_file=None, use_cache=False):
+    """Compares two exports, prints the report and optionally writes a JSON report and an HTML view of the changes."""
+    print(f"Comparing '{old_file}' -> '{new_file}'")
+    old_graphs = load_diff_graphs(old_file, use_cache)
+    new_graphs = load_diff_graphs(new_file, use_cache)
+    if old_graphs is None or new_graphs is None:
+        return None
+    
+    (old_graph, old_filtered_graph), (new_graph, new_filtered_graph) = old_graphs, new_graphs
+    diff = diff_graphs(old_graph, new_graph)
+    print_diff_report(diff, old_graph, new_graph)
+    
+    if report_file:
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump({'old': old_file, 'new': new_file, **diff}, f, indent=2)
+        print(f"\nWrote diff report: '{report_file}'")
+    
+    if output_file_name:
+        context_items = old_filtered_graph[2].keys() | new_filtered_graph[2].keys()
+        diff_graph = build_diff_graph(old_graph, new_graph, diff, context_items)
+        if diff_graph[2]:
+            print()
+            write_web_interface(*diff_graph, output_file_name)
+        else:
+            print("\nNo differences, skipping the HTML view")
+    return diff
+
+def diff_main(argv):
+    """Command line entry point for `diff OLD NEW`."""
+    parser = argparse.ArgumentParser(
+        prog=f"{os.path.basename(sys.argv[0])} diff",
+        description="Compares two Mantle exports and reports added/removed items and relationships.",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("old_file", help="Path to the older CSV file (or SQLite database written with --sqlite)")
+    parser.add_argument("new_file", help="Path to the newer CSV file (or SQLite database written with --sqlite)")
+    parser.add_argument(
+        "-o", "--output",
+        default="mantle_network_diff.html",
+        help="Name for the HTML view of the changed items (default: mantle_network_diff.html)"
+    )
+    parser.add_argument(
+        "--report",
+        metavar="JSON_FILE",
+        help="Also write the complete list of differences as JSON"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse (and write) the Arrow/Feather cache next to each CSV; requires the 'pyarrow' package"
+    )
+    args = parser.parse_args(argv)
+    
+    run_diff(args.old_file, args.new_file, args.output, args.report, args.cache)
 
 # --- Main Execution ---
+def non_negative_int(value):
+    """argparse type for counts where 0 means no limit."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {value}")
+    return number
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be 1 or more, got {value}")
+    return number
+
 def main():
     """Main function to run the script from the command line."""
+    # `diff OLD NEW` has its own options; everything else is the explorer
+    if len(sys.argv) > 1 and sys.argv[1] == 'diff':
+        diff_main(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(
-        description="Generates an interactive web interface for exploring the Mantle network.",
+        description="Generates an interactive web interface for exploring the Mantle network.\n"
+                    "Run with 'diff OLD NEW' to compare two exports instead.",
         formatter_class=argparse.RawTextHelpFormatter
     )
     parser.add_argument(
         "csv_file",
-        help="Path to the input CSV file (e.g., mantle_benefits_8052.csv)"
+        help="Path to the input CSV file (e.g., mantle_benefits_8052.csv),\n"
+             "or an SQLite database previously written with --sqlite"
     )
     parser.add_argument(
         "-o", "--output",
         default="mantle_network_explorer.html",
         help="Name for the output HTML file (default: mantle_network_explorer.html)"
     )
+    parser.add_argument(
+        "--compress",
+        nargs="+",
+        choices=COMPRESSED_OUTPUTS,
+        default=[],
+        metavar="FORMAT",
+        help="Also write compressed outputs next to the HTML file:\n"
+             "  gz     - gzip copy (<output>.gz) for web servers\n"
+             "  br     - Brotli copy (<output>.br), requires the 'brotli' package\n"
+             "  packed - page with gzip-compressed data unpacked by the browser (<name>.packed.html)"
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=SHARD_ATTRIBUTES,
+        help="Write one lightweight page per display_group or id_event value, plus an index page,\n"
+             "into <output>_by_<attribute>/ instead of a single page"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=positive_int,
+        default=None,
+        help="Number of worker processes for --shard-by (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--sqlite",
+        metavar="DB_FILE",
+        help="Also save the filtered graph to an indexed SQLite database that can be\n"
+             "passed instead of the CSV file to skip parsing"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Keep the extracted items and relationships in Arrow/Feather files next to the CSV\n"
+             "(<name>.items.arrow, <name>.edges.arrow) and reuse them while the CSV is unchanged,\n"
+             "skipping CSV parsing; requires the 'pyarrow' package"
+    )
+    parser.add_argument(
+        "-q", "--query",
+        metavar="ITEM_ID",
+        help="Print the items related to ITEM_ID instead of generating the web interface"
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=2,
+        help="Relationship depth for --query (default: 2)"
+    )
+    parser.add_argument(
+        "--max-fanout",
+        type=non_negative_int,
+        default=DEFAULT_MAX_FANOUT,
+        metavar="N",
+        help="Show at most N new neighbours per node and collapse the rest into a \"+N more\" node;\n"
+             "used by --query and as the page's initial setting, 0 = no limit (default: 25)"
+    )
+    parser.add_argument(
+        "--rank-by",
+        choices=FANOUT_RANKINGS,
+        default="degree",
+        help="Which neighbours --max-fanout keeps: the most connected (degree), or flagged\n"
+             "actuarial/payment items first (flagged) (default: degree)"
+    )
+    parser.add_argument(
+        "-w", "--watch",
+        action="store_true",
+        help="Keep running and regenerate the output whenever the CSV file changes"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checks for CSV changes in watch mode (default: 1.0)"
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.5,
+        help="Seconds the CSV must stay unchanged before regenerating in watch mode (default: 0.5)"
+    )
     
     if len(sys.argv) == 1:
         parser.print_help(sys.stderr)
@@ -920,8 +2658,22 @@ def main():
         
     args = parser.parse_args()
 
+    if args.query:
+        query_related_items(args.csv_file, args.query, args.depth, args.cache, args.max_fanout, args.rank_by)
+        return
+
+    if args.watch:
+        watch_and_regenerate(
+            args.csv_file, args.output, args.poll_interval, args.debounce, args.compress, args.sqlite, args.cache,
+            args.shard_by, args.jobs, args.max_fanout, args.rank_by
+        )
+        return
+
     # Generate the web interface
-    generate_web_interface(args.csv_file, args.output)
+    generate_web_interface(
+        args.csv_file, args.output, args.compress, args.sqlite, args.cache, args.shard_by, args.jobs, args.max_fanout,
+        args.rank_by
+    )
 
 if __name__ == "__main__":
     main()